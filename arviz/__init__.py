@@ -2,13 +2,16 @@
 """ArviZ is a library for exploratory analysis of Bayesian models."""
 __version__ = "0.2.1"
 
-import os
+import importlib
 import logging
-from matplotlib.pyplot import style
+import os
+import sys
+import types
+
+from matplotlib import style
 
 # add ArviZ's styles to matplotlib's styles
-arviz_style_path = os.path.join(os.path.dirname(__file__), "plots", "styles")
-style.core.USER_LIBRARY_PATHS.append(arviz_style_path)
+style.core.USER_LIBRARY_PATHS.append(os.path.join(os.path.dirname(__file__), "plots", "styles"))
 style.core.reload_library()
 
 # Configure logging before importing arviz internals
@@ -20,5 +23,67 @@ if not logging.root.handlers:
     _log.addHandler(handler)
 
 from .data import *
-from .plots import *
-from .stats import *
+from . import data as _data
+
+# Plotting (matplotlib.pyplot) and statistics (scipy) are only imported on first use, so that
+# workers which only convert data do not pay for them at import time. The names must match
+# the `__all__` of each submodule, see `tests/test_import.py`.
+_LAZY_SUBMODULES = {
+    "plots": (
+        "plot_autocorr",
+        "plot_compare",
+        "plot_density",
+        "plot_energy",
+        "plot_forest",
+        "plot_kde",
+        "kde_cache",
+        "_fast_kde",
+        "_fast_kde_2d",
+        "plot_parallel",
+        "plot_posterior",
+        "plot_trace",
+        "plot_pair",
+        "plot_joint",
+        "plot_khat",
+        "plot_ppc",
+        "plot_violin",
+        "plot_hpd",
+    ),
+    "stats": (
+        "bfmi",
+        "compare",
+        "hpd",
+        "loo",
+        "psislw",
+        "r2_score",
+        "summary",
+        "waic",
+        "effective_n",
+        "gelman_rubin",
+        "geweke",
+        "autocorr",
+    ),
+}
+_LAZY_ATTRS = {attr: submodule for submodule, attrs in _LAZY_SUBMODULES.items() for attr in attrs}
+
+__all__ = _data.__all__ + list(_LAZY_ATTRS) + ["style"]
+
+
+class _LazyModule(types.ModuleType):
+    """Module type resolving plotting and statistics functions on first access."""
+
+    def __getattr__(self, name):
+        if name in _LAZY_SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        if name in _LAZY_ATTRS:
+            submodule = importlib.import_module("." + _LAZY_ATTRS[name], __name__)
+            value = getattr(submodule, name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY_SUBMODULES) | set(_LAZY_ATTRS))
+
+
+sys.modules[__name__].__class__ = _LazyModule
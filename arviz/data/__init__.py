@@ -1,9 +1,13 @@
 """Code for loading and manipulating data structures."""
-from .inference_data import InferenceData
+from .inference_data import InferenceData, concat
 from .io_netcdf import load_data, save_data
 from .datasets import load_arviz_data, list_datasets, clear_data_home
 from .base import numpy_to_data_array, dict_to_dataset
-from .converters import convert_to_dataset, convert_to_inference_data
+from .converters import (
+    convert_to_dataset,
+    convert_to_inference_data,
+    batch_convert_to_inference_data,
+)
 from .io_cmdstan import from_cmdstan
 from .io_pymc3 import from_pymc3
 from .io_pystan import from_pystan
@@ -13,6 +17,7 @@ from .io_tfp import from_tfp
 
 __all__ = [
     "InferenceData",
+    "concat",
     "load_data",
     "save_data",
     "load_arviz_data",
@@ -22,6 +27,7 @@ __all__ = [
     "dict_to_dataset",
     "convert_to_dataset",
     "convert_to_inference_data",
+    "batch_convert_to_inference_data",
     "from_pymc3",
     "from_pystan",
     "from_emcee",
@@ -1,12 +1,12 @@
 """Low level converters usually used by other functions."""
-from copy import deepcopy
 import datetime
 import warnings
 
 import numpy as np
-import pkg_resources
 import xarray as xr
 
+_LIBRARY_VERSIONS = {}
+
 
 class requires:  # pylint: disable=invalid-name
     """Decorator to return None if an object does not have the required attribute."""
@@ -65,8 +65,9 @@ def generate_dims_coords(shape, var_name, dims=None, coords=None, default_dims=N
     if coords is None:
         coords = {}
 
-    coords = deepcopy(coords)
-    dims = deepcopy(dims)
+    # shallow copies are enough: only keys are added, coordinate values are never modified
+    coords = dict(coords)
+    dims = list(dims)
 
     for idx, dim_len in enumerate(shape):
         if (len(dims) < idx + 1) or (dims[idx] is None):
@@ -101,14 +102,16 @@ def numpy_to_data_array(ary, *, var_name="data", coords=None, dims=None):
         If there are no dims passed, this string is used to name dimensions
     coords : dict[str, iterable]
         A dictionary containing the values that are used as index. The key
-        is the name of the dimension, the values are the index values.
+        is the name of the dimension, the values are the index values. Values that
+        are already `xr.IndexVariable` objects are used as they are.
     dims : List(str)
         A list of coordinate names for the variable
 
     Returns
     -------
     xr.DataArray
-        Will have the same data as passed, but with coordinates and dimensions
+        Will have the same data as passed, but with coordinates and dimensions. The
+        data is not copied, so the DataArray shares memory with `ary`.
     """
     # manage and transform copies
     default_dims = ["chain", "draw"]
@@ -139,10 +142,17 @@ def numpy_to_data_array(ary, *, var_name="data", coords=None, dims=None):
         coords["draw"] = np.arange(n_samples)
 
     # filter coords based on the dims
-    coords = {key: xr.IndexVariable((key,), data=coords[key]) for key in dims}
+    coords = {key: _as_index_variable(key, coords[key]) for key in dims}
     return xr.DataArray(ary, coords=coords, dims=dims)
 
 
+def _as_index_variable(dim, values):
+    """Wrap coordinate values in an IndexVariable, reusing existing ones."""
+    if isinstance(values, xr.IndexVariable):
+        return values
+    return xr.IndexVariable((dim,), data=values)
+
+
 def dict_to_dataset(data, *, attrs=None, library=None, coords=None, dims=None):
     """Convert a dictionary of numpy arrays to an xarray.Dataset.
 
@@ -171,6 +181,17 @@ def dict_to_dataset(data, *, attrs=None, library=None, coords=None, dims=None):
     """
     if dims is None:
         dims = {}
+    if coords is not None:
+        # build the index objects once, so all variables share them. Coordinates no variable
+        # can use are left as they are, numpy_to_data_array filters them out
+        used_dims = {"chain", "draw"}
+        for key, values in data.items():
+            used_dims.update(dims.get(key, ()))
+            used_dims.update("{}_dim_{}".format(key, idx) for idx in range(np.ndim(values)))
+        coords = {
+            key: _as_index_variable(key, values) if key in used_dims else values
+            for key, values in coords.items()
+        }
 
     data_vars = {}
     for key, values in data.items():
@@ -197,12 +218,30 @@ def make_attrs(attrs=None, library=None):
     if library is not None:
         library_name = library.__name__
         default_attrs["inference_library"] = library_name
-        try:
-            version = pkg_resources.get_distribution(library_name).version
+        version = _library_version(library)
+        if version is not None:
             default_attrs["inference_library_version"] = version
-        except pkg_resources.DistributionNotFound:
-            pass
 
     if attrs is not None:
         default_attrs.update(attrs)
     return default_attrs
+
+
+def _library_version(library):
+    """Return the version of an inference library, or None if it can not be found.
+
+    The module's `__version__` is used when available, falling back to the (slow)
+    package metadata. Results are cached, so the lookup happens once per process.
+    """
+    library_name = library.__name__
+    if library_name not in _LIBRARY_VERSIONS:
+        version = getattr(library, "__version__", None)
+        if version is None:
+            import pkg_resources
+
+            try:
+                version = pkg_resources.get_distribution(library_name).version
+            except pkg_resources.DistributionNotFound:
+                pass
+        _LIBRARY_VERSIONS[library_name] = version
+    return _LIBRARY_VERSIONS[library_name]
@@ -1,15 +1,25 @@
 """High level conversion functions."""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+import pickle
+
 import numpy as np
+import pandas as pd
 import xarray as xr
 
-from .inference_data import InferenceData
-from .base import dict_to_dataset
+from .inference_data import InferenceData, concat
+from .base import dict_to_dataset, _as_index_variable
 from .io_emcee import from_emcee
 from .io_pymc3 import from_pymc3
 from .io_pyro import from_pyro
 from .io_pystan import from_pystan
 
 
+# cheap to convert, or not thread-safe to read, so never sent to a pool of processes
+_CONVERTED_IN_PROCESS = (str, dict, np.ndarray, xr.Dataset, InferenceData)
+
+
 # pylint: disable=too-many-return-statements
 def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None, **kwargs):
     r"""Convert a supported object to an InferenceData object.
@@ -22,7 +32,8 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
     obj : dict, str, np.ndarray, xr.Dataset, pystan fit, pymc3 trace
         A supported object to convert to InferenceData:
             | InferenceData: returns unchanged
-            | str: Attempts to load the netcdf dataset from disk
+            | str: Attempts to load the netcdf dataset from disk, or the directory
+                   written by `InferenceData.to_npy` if `obj` is a directory
             | pystan fit: Automatically extracts data
             | pymc3 trace: Automatically extracts data
             | emcee sampler: Automatically extracts data
@@ -50,6 +61,8 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
     if isinstance(obj, InferenceData):
         return obj
     elif isinstance(obj, str):
+        if os.path.isdir(obj):
+            return InferenceData.from_npy(obj)
         return InferenceData.from_netcdf(obj)
     elif obj.__class__.__name__ == "StanFit4Model":  # ugly, but doesn't make PyStan a requirement
         return from_pystan(posterior=obj, coords=coords, dims=dims, **kwargs)
@@ -85,6 +98,102 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
     return InferenceData(**{group: dataset})
 
 
+def batch_convert_to_inference_data(
+    objs, *, dim=None, group="posterior", coords=None, dims=None, n_jobs=1, **kwargs
+):
+    """Convert a sequence of supported objects to InferenceData objects.
+
+    Each object is converted by `convert_to_inference_data`. The coordinates are
+    built once and shared by all conversions.
+
+    Parameters
+    ----------
+    objs : iterable
+        Objects supported by `convert_to_inference_data`, e.g. one fit per
+        cross-validation fold.
+    dim : str, optional
+        If given, the results are combined into a single InferenceData. Every group
+        is stacked along a new leading dimension with this name. Otherwise a list of
+        InferenceData is returned.
+    group : str
+        If the objects are dicts or numpy arrays, assigns the resulting xarray
+        datasets to this group. Default: "posterior".
+    coords : dict[str, iterable]
+        A dictionary containing the values that are used as index. The key
+        is the name of the dimension, the values are the index values. `coords[dim]`
+        labels the stacked objects, and defaults to their position.
+    dims : dict[str, List(str)]
+        A mapping from variables to a list of coordinate names for the variable
+    n_jobs : int or None
+        Number of processes used to convert fits from inference libraries, which is CPU-bound.
+        Fits are pickled and sent to a pool of processes. Fits that can not be pickled, and all
+        other objects, are converted one at a time in the calling process while the pool
+        works: building datasets from dicts and numpy arrays is cheaper than sending them to
+        another process, and the netCDF4/HDF5 library used to read files is not thread-safe.
+        If None, uses the number of processors on the machine. Defaults to 1, which converts
+        everything in the calling process.
+    kwargs
+        Rest of the supported keyword arguments transferred to conversion function.
+
+    Returns
+    -------
+    list of InferenceData, or InferenceData if `dim` is given
+    """
+    objs = list(objs)
+    dim_coords = None
+    if coords is not None:
+        dim_coords = coords.get(dim)
+        # share the index objects between conversions, other values are filtered out later
+        coords = {
+            key: _as_index_variable(key, values) if np.ndim(values) == 1 else values
+            for key, values in coords.items()
+            if key != dim
+        }
+    convert = partial(convert_to_inference_data, group=group, coords=coords, dims=dims, **kwargs)
+    fits = [idx for idx, obj in enumerate(objs) if not isinstance(obj, _CONVERTED_IN_PROCESS)]
+    if n_jobs == 1 or len(fits) < 2:
+        return _stack([convert(obj) for obj in objs], dim, dim_coords)
+
+    inference_data = [None] * len(objs)
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {}
+        for idx in fits:
+            payload = _pickle_or_none(objs[idx])
+            if payload is not None:
+                futures[idx] = executor.submit(_convert_pickled, payload, convert)
+        # everything else is converted here while the pool works on the fits
+        for idx, obj in enumerate(objs):
+            if idx not in futures:
+                inference_data[idx] = convert(obj)
+        for idx, future in futures.items():
+            inference_data[idx] = future.result()
+    return _stack(inference_data, dim, dim_coords)
+
+
+def _pickle_or_none(obj):
+    """Pickle an object for a worker process, or return None if it can not be pickled."""
+    try:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _convert_pickled(payload, convert):
+    """Unpickle and convert an object in a worker process."""
+    return convert(pickle.loads(payload))
+
+
+def _stack(inference_data, dim, dim_coords):
+    """Stack InferenceData objects along a new dimension `dim`, if it is given."""
+    if dim is None:
+        return inference_data
+    if not inference_data:
+        raise ValueError("Can not stack an empty sequence of objects along {}".format(dim))
+    if dim_coords is None:
+        dim_coords = np.arange(len(inference_data))
+    return concat(*inference_data, dim=pd.Index(dim_coords, name=dim))
+
+
 def convert_to_dataset(obj, *, group="posterior", coords=None, dims=None):
     """Convert a supported object to an xarray dataset.
 
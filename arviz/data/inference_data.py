@@ -1,5 +1,10 @@
 """Data structure for using netcdf groups with xarray."""
+import json
+import os
+
 import netCDF4 as nc
+import numpy as np
+import pandas as pd
 import xarray as xr
 
 
@@ -36,6 +41,74 @@ class InferenceData:
             options="\n\t> ".join(self._groups)
         )
 
+    def sel(self, var_names=None, **indexers):
+        """Select values by label in every group that has the indexed dimensions.
+
+        Dimensions shared by several groups, like `chain` and `draw`, are subset
+        consistently, while groups lacking a dimension are left untouched by it. Slices
+        return views of the original data where xarray allows it, so no arrays are
+        copied.
+
+        Examples
+        --------
+        Remove the first 100 draws: `data.sel(draw=slice(100, None))`
+
+        Parameters
+        ----------
+        var_names : list of str, optional
+            Variables to keep in the groups that contain them. Groups containing none of
+            them are kept whole.
+        **indexers
+            Labels to select for each dimension, as in `xarray.Dataset.sel`.
+
+        Returns
+        -------
+        InferenceData
+        """
+        return self._subset("sel", var_names, indexers)
+
+    def isel(self, var_names=None, **indexers):
+        """Select values by position in every group that has the indexed dimensions.
+
+        Same as `InferenceData.sel`, but with integer positions instead of labels.
+
+        Examples
+        --------
+        Keep every 5th draw: `data.isel(draw=slice(None, None, 5))`
+
+        Parameters
+        ----------
+        var_names : list of str, optional
+            Variables to keep in the groups that contain them. Groups containing none of
+            them are kept whole.
+        **indexers
+            Positions to select for each dimension, as in `xarray.Dataset.isel`.
+
+        Returns
+        -------
+        InferenceData
+        """
+        return self._subset("isel", var_names, indexers)
+
+    def _subset(self, method, var_names, indexers):
+        """Apply `Dataset.sel` or `Dataset.isel` to every group."""
+        datasets = [getattr(self, group) for group in self._groups]
+        for dim in indexers:
+            if all(dim not in dataset.dims for dataset in datasets):
+                raise ValueError("Dimension {} is not present in any group".format(dim))
+
+        groups = {}
+        for group, dataset in zip(self._groups, datasets):
+            if var_names is not None:
+                group_var_names = [name for name in var_names if name in dataset.data_vars]
+                if group_var_names:
+                    dataset = dataset[group_var_names]
+            group_indexers = {dim: idx for dim, idx in indexers.items() if dim in dataset.dims}
+            if group_indexers:
+                dataset = getattr(dataset, method)(**group_indexers)
+            groups[group] = dataset
+        return InferenceData(**groups)
+
     @staticmethod
     def from_netcdf(filename):
         """Initialize object from a netcdf file.
@@ -86,3 +159,175 @@ class InferenceData:
             data.close()
             mode = "a"
         return filename
+
+    @staticmethod
+    def from_npy(dirname, mmap_mode="r"):
+        """Initialize object from a directory written by `InferenceData.to_npy`.
+
+        Every variable is stored as a raw `.npy` file, so arrays are memory mapped
+        instead of decoded. Opening is instant regardless of the size of the groups,
+        and data is only read from disk when it is accessed.
+
+        Parameters
+        ----------
+        dirname : str
+            location of the directory
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            Memory mapping mode passed to `numpy.load`. Use None to read all arrays into
+            memory (default: 'r').
+
+        Returns
+        -------
+        InferenceData object
+        """
+        with open(os.path.join(dirname, _NPY_METADATA), "r") as buff:
+            metadata = json.load(buff)
+
+        groups = {}
+        for group, group_metadata in metadata["groups"].items():
+            variables = {}
+            for name, var_metadata in group_metadata["variables"].items():
+                path = os.path.join(dirname, group, var_metadata["filename"])
+                values = np.load(path, mmap_mode=mmap_mode)
+                variables[name] = (var_metadata["dims"], values, var_metadata["attrs"])
+            coords = {
+                name: variables.pop(name) for name in group_metadata["coords"] if name in variables
+            }
+            groups[group] = xr.Dataset(
+                data_vars=variables, coords=coords, attrs=group_metadata["attrs"]
+            )
+        return InferenceData(**groups)
+
+    def to_npy(self, dirname):
+        """Write InferenceData to a directory of raw `.npy` files.
+
+        Each group is a subdirectory holding one `.npy` file per variable, and the
+        dims, coords and attrs of every group are kept in a json file at the top
+        of the directory. Read it back with `InferenceData.from_npy`.
+
+        Parameters
+        ----------
+        dirname : str
+            Location to write to
+
+        Returns
+        -------
+        str
+            Location of the directory
+        """
+        metadata = {"groups": {}}
+        for group in self._groups:
+            data = getattr(self, group)
+            os.makedirs(os.path.join(dirname, group), exist_ok=True)
+            variables = {}
+            for idx, (name, variable) in enumerate(data.variables.items()):
+                values = variable.values
+                if values.dtype.kind == "O":
+                    # object arrays can not be memory mapped
+                    values = values.astype(str)
+                filename = "{}.npy".format(idx)
+                np.save(os.path.join(dirname, group, filename), values, allow_pickle=False)
+                variables[name] = {
+                    "filename": filename,
+                    "dims": list(variable.dims),
+                    "attrs": variable.attrs,
+                }
+            metadata["groups"][group] = {
+                "variables": variables,
+                "coords": list(data.coords),
+                "attrs": data.attrs,
+            }
+        with open(os.path.join(dirname, _NPY_METADATA), "w") as buff:
+            json.dump(metadata, buff, default=_json_default)
+        return dirname
+
+
+def concat(*args, dim="chain"):
+    """Concatenate InferenceData objects group by group.
+
+    Use it to combine chains sampled on separate machines (`dim="chain"`), to append
+    draws (`dim="draw"`), or to stack runs along a new leading dimension. Groups
+    without the concatenation dimension, such as `observed_data`, must be equal in
+    all objects and are taken from the first one.
+
+    Non-concatenated coordinates are validated once per group, and each variable is
+    written with a single concatenation, so xarray's per variable alignment is
+    skipped. Variables backed by dask arrays stay lazy.
+
+    Parameters
+    ----------
+    *args : InferenceData
+        Objects to concatenate. All of them must have the same groups and variables.
+    dim : str or pandas.Index
+        Dimension to concatenate along (default: "chain"). A name that is not a
+        dimension of any group creates a new leading dimension, labelled by the
+        values of the index if a `pandas.Index` is given, or by position otherwise.
+        Existing dimensions keep their labels if these are unique after
+        concatenation, and are renumbered from 0 otherwise.
+
+    Returns
+    -------
+    InferenceData
+    """
+    if not args:
+        raise ValueError("At least one InferenceData object is needed to concatenate")
+    groups = args[0]._groups  # pylint: disable=protected-access
+    for arg in args[1:]:
+        if set(arg._groups) != set(groups):  # pylint: disable=protected-access
+            raise ValueError("All InferenceData objects must have the same groups")
+
+    if isinstance(dim, pd.Index):
+        dim, index = dim.name, dim
+    else:
+        index = None
+    new_dim = all(dim not in getattr(args[0], group).dims for group in groups)
+    if new_dim and index is None:
+        index = pd.Index(np.arange(len(args)), name=dim)
+    return InferenceData(
+        **{
+            group: _concat_datasets([getattr(arg, group) for arg in args], dim, index, new_dim)
+            for group in groups
+        }
+    )
+
+
+def _concat_datasets(datasets, dim, index, new_dim):
+    """Concatenate xarray datasets with identical variables and coordinates."""
+    first = datasets[0]
+    for dataset in datasets[1:]:
+        if set(dataset.data_vars) != set(first.data_vars):
+            raise ValueError("All datasets of a group must have the same variables")
+        for name, values in first.indexes.items():
+            if name != dim and not values.equals(dataset.indexes.get(name)):
+                raise ValueError("Coordinate {} differs between objects".format(name))
+
+    if not new_dim and dim not in first.dims:
+        for dataset in datasets[1:]:
+            if not dataset.equals(first):
+                raise ValueError(
+                    "Groups without a {} dimension must be equal in all objects".format(dim)
+                )
+        return first
+
+    data_vars = {}
+    for name, variable in first.data_vars.items():
+        variables = [dataset[name].variable.transpose(*variable.dims) for dataset in datasets]
+        data_vars[name] = xr.Variable.concat(variables, dim=dim)
+
+    coords = {name: coord.variable for name, coord in first.coords.items() if dim not in coord.dims}
+    if index is None:
+        index = pd.Index(np.concatenate([dataset.indexes[dim] for dataset in datasets]), name=dim)
+        if not index.is_unique:
+            index = pd.Index(np.arange(len(index)), name=dim)
+    coords[dim] = index
+    return xr.Dataset(data_vars=data_vars, coords=coords, attrs=first.attrs)
+
+
+_NPY_METADATA = "inference_data.json"
+
+
+def _json_default(obj):
+    """Serialize numpy values found in attrs."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    return str(obj)
@@ -1,8 +1,9 @@
 """CmdStan-specific conversion code."""
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from glob import glob
-import linecache
+from io import StringIO
 import os
 import re
 
@@ -31,8 +32,10 @@ class CmdStanConverter:
         observed_data_var=None,
         log_likelihood=None,
         coords=None,
-        dims=None
+        dims=None,
+        n_jobs=1
     ):
+        self.n_jobs = n_jobs
         if isinstance(posterior, str):
             posterior_glob = glob(posterior)
             if len(posterior_glob) > 1:
@@ -100,8 +103,7 @@ class CmdStanConverter:
         if isinstance(paths, str):
             paths = [paths]
         chain_data = []
-        for path in paths:
-            parsed_output = _read_output(path)
+        for parsed_output in _read_output_files(paths, n_jobs=self.n_jobs):
             for sample, sample_stats, config, adaptation, timing in parsed_output:
                 chain_data.append(
                     {
@@ -122,8 +124,7 @@ class CmdStanConverter:
         if isinstance(paths, str):
             paths = [paths]
         chain_data = []
-        for path in paths:
-            parsed_output = _read_output(path)
+        for parsed_output in _read_output_files(paths, n_jobs=self.n_jobs):
             for sample, sample_stats, config, adaptation, timing in parsed_output:
                 chain_data.append(
                     {
@@ -239,8 +240,7 @@ class CmdStanConverter:
             if isinstance(posterior_predictive, str):
                 posterior_predictive = [posterior_predictive]
             chain_data = []
-            for path in posterior_predictive:
-                parsed_output = _read_output(path)
+            for parsed_output in _read_output_files(posterior_predictive, n_jobs=self.n_jobs):
                 for sample, *_ in parsed_output:
                     chain_data.append(sample)
             data = _unpack_dataframes(chain_data)
@@ -314,8 +314,7 @@ class CmdStanConverter:
             if isinstance(prior_predictive, str):
                 prior_predictive = [prior_predictive]
             chain_data = []
-            for path in prior_predictive:
-                parsed_output = _read_output(path)
+            for parsed_output in _read_output_files(prior_predictive, n_jobs=self.n_jobs):
                 for sample, *_ in parsed_output:
                     chain_data.append(sample)
             data = _unpack_dataframes(chain_data)
@@ -396,6 +395,10 @@ def _process_configuration(comments):
 def _read_output(path):
     """Read CmdStan output.csv.
 
+    The file is scanned once. Comment lines are sorted into configuration, adaptation
+    and timing information, and the data rows of each chain are parsed in one call to
+    the C engine of `pandas.read_csv` with float dtype.
+
     Parameters
     ----------
     path : str
@@ -414,140 +417,61 @@ def _read_output(path):
         List[str]
             Timing info
     """
-    chains = []
-    configuration_info = []
-    adaptation_info = []
-    timing_info = []
-    i = 0
-    # Read (first) configuration and adaption
+    raw_chains = []
+    header = None
     with open(path, "r") as f_obj:
-        column_names = False
-        for i, line in enumerate(f_obj):
-            line = line.strip()
+        comments = []
+        for line in f_obj:
             if line.startswith("#"):
-                if column_names:
-                    adaptation_info.append(line.strip())
+                comments.append(line.strip())
+            elif header is None or line == header:
+                # header found, comments before it belong to the previous chain
+                if header is None:
+                    header = line
+                    timing_info, configuration_info = [], comments
                 else:
-                    configuration_info.append(line.strip())
-            elif not column_names:
-                column_names = True
-                pconf = _process_configuration(configuration_info)
-                if pconf["save_warmup"]:
-                    warmup_range = range(pconf["num_warmup"] // pconf["thin"])
-                    for _, _ in zip(warmup_range, f_obj):
-                        continue
-            else:
-                break
-
-    # Read data
-    with open(path, "r") as f_obj:
-        df = pd.read_csv(f_obj, comment="#")
-
-    # split dataframe if header found multiple times
-    if df.iloc[:, 0].dtype.kind == "O":
-        first_col = df.columns[0]
-        col_locations = first_col == df.loc[:, first_col]
-        col_locations = list(col_locations.loc[col_locations].index)
-        dfs = []
-        for idx, last_idx in zip(col_locations, [-1] + list(col_locations[:-1])):
-            df_ = deepcopy(df.loc[last_idx + 1 : idx - 1, :])
-            for col in df_.columns:
-                df_.loc[:, col] = pd.to_numeric(df_.loc[:, col])
-            if len(df_):
-                dfs.append(df_.reset_index(drop=True))
-            df = df.loc[idx + 1 :, :]
-        for col in df.columns:
-            df.loc[:, col] = pd.to_numeric(df.loc[:, col])
-        dfs.append(df)
-    else:
-        dfs = [df]
-
-    for j, df in enumerate(dfs):
-        if j == 0:
-            # Read timing info (first) from the end of the file
-            line_num = i + df.shape[0] + 1
-            for k in range(5):
-                line = linecache.getline(path, line_num + k).strip()
-                if len(line):
-                    timing_info.append(line)
-            configuration_info_len = len(configuration_info)
-            adaptation_info_len = len(adaptation_info)
-            timing_info_len = len(timing_info)
-            num_of_samples = df.shape[0]
-            header_count = 1
-            last_line_num = (
-                configuration_info_len
-                + adaptation_info_len
-                + timing_info_len
-                + num_of_samples
-                + header_count
-            )
-        else:
-            # header location found in the dataframe (not first)
-            configuration_info = []
-            adaptation_info = []
-            timing_info = []
-
-            # line number for the next dataframe in csv
-            line_num = last_line_num + 1
-
-            # row ranges
-            config_start = line_num
-            config_end = config_start + configuration_info_len
-
-            # read configuration_info
-            for reading_line in range(config_start, config_end):
-                line = linecache.getline(path, reading_line)
-                if line.startswith("#"):
-                    configuration_info.append(line)
-                else:
-                    msg = (
-                        "Invalid input file. "
-                        "Header information missing from combined csv. "
-                        "Configuration: {}".format(path)
-                    )
-                    raise ValueError(msg)
-
-            pconf = _process_configuration(configuration_info)
-            warmup_rows = pconf["save_warmup"] * pconf["num_warmup"] // pconf["thin"]
-            adaption_start = config_end + 1 + warmup_rows
-            adaption_end = adaption_start + adaptation_info_len
-            # read adaptation_info
-            for reading_line in range(adaption_start, adaption_end):
-                line = linecache.getline(path, reading_line)
-                if line.startswith("#"):
-                    adaptation_info.append(line)
-                else:
-                    msg = (
-                        "Invalid input file. "
-                        "Header information missing from combined csv. "
-                        "Adaptation: {}".format(path)
-                    )
-                    raise ValueError(msg)
-
-            timing_start = adaption_end + len(df) - warmup_rows
-            timing_end = timing_start + timing_info_len
-            # read timing_info
-            raise_timing_error = False
-            for reading_line in range(timing_start, timing_end):
-                line = linecache.getline(path, reading_line)
-                if line.startswith("#"):
-                    timing_info.append(line)
-                else:
-                    raise_timing_error = True
-                    break
-            no_elapsed_time = not any("elapsed time" in row.lower() for row in timing_info)
-            if raise_timing_error or no_elapsed_time:
-                msg = (
-                    "Invalid input file. "
-                    "Header information missing from combined csv. "
-                    "Timing: {}".format(path)
+                    timing_info, configuration_info = _split_timing_info(comments)
+                    raw_chains[-1]["timing_info"] = timing_info
+                raw_chains.append(
+                    {
+                        "configuration_info": configuration_info,
+                        "adaptation_info": [],
+                        "timing_info": [],
+                        "lines": [],
+                    }
                 )
-                raise ValueError(msg)
+                comments = []
+            elif line.strip():
+                if comments:
+                    raw_chains[-1]["adaptation_info"].extend(comments)
+                    comments = []
+                raw_chains[-1]["lines"].append(line)
+        if raw_chains:
+            raw_chains[-1]["timing_info"], _ = _split_timing_info(comments)
+
+    if header is None:
+        raise ValueError("Invalid input file. No column names found: {}".format(path))
+    columns = header.strip().split(",")
 
-            last_line_num = reading_line
+    chains = []
+    for raw_chain in raw_chains:
+        configuration_info = raw_chain["configuration_info"]
+        adaptation_info = raw_chain["adaptation_info"]
+        timing_info = raw_chain["timing_info"]
+        if len(raw_chains) > 1:
+            _validate_combined_chain(raw_chain, raw_chains[0], path)
+
+        df = pd.read_csv(
+            StringIO("".join(raw_chain["lines"])),
+            header=None,
+            names=columns,
+            dtype=np.float64,
+            engine="c",
+            low_memory=False,
+        )
 
         # Remove warmup
+        pconf = _process_configuration(configuration_info)
         if pconf["save_warmup"]:
             saved_samples = pconf["num_samples"] // pconf["thin"]
             df = df.iloc[-saved_samples:, :]
@@ -564,10 +488,67 @@ def _read_output(path):
     return chains
 
 
+def _read_output_files(paths, n_jobs=1):
+    """Read a list of CmdStan output.csv files, in parallel if requested.
+
+    Parsing csv files is CPU-bound, so files are distributed to a pool of processes.
+
+    Parameters
+    ----------
+    paths : List[str]
+    n_jobs : int or None
+        Number of processes. If None, uses the number of processors on the machine.
+
+    Returns
+    -------
+    List
+        Output of `_read_output` for each path, in the same order as `paths`.
+    """
+    if n_jobs == 1 or len(paths) < 2:
+        return [_read_output(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(_read_output, paths))
+
+
+def _split_timing_info(comments):
+    """Split trailing comments to timing info of a chain and configuration of the next one.
+
+    Parameters
+    ----------
+    comments : List[str]
+
+    Returns
+    -------
+    List[str], List[str]
+        timing info, configuration info
+    """
+    for idx, comment in enumerate(comments):
+        if "elapsed time" in comment.lower():
+            break
+    else:
+        return [], comments
+    for idx in range(idx + 1, len(comments)):
+        if not comments[idx].strip("#").strip():
+            break
+    return comments[: idx + 1], comments[idx + 1 :]
+
+
+def _validate_combined_chain(raw_chain, first_chain, path):
+    """Check that a chain from a combined csv has all of its header information."""
+    msg = "Invalid input file. Header information missing from combined csv. {}: {}"
+    if not raw_chain["configuration_info"]:
+        raise ValueError(msg.format("Configuration", path))
+    if first_chain["adaptation_info"] and not raw_chain["adaptation_info"]:
+        raise ValueError(msg.format("Adaptation", path))
+    if not any("elapsed time" in row.lower() for row in raw_chain["timing_info"]):
+        raise ValueError(msg.format("Timing", path))
+
+
 def _process_data_var(string):
     """Transform datastring to key, values pair.
 
-    All values are transformed to floating point values.
+    Values are integers if every value in the string is written as an integer,
+    otherwise they are transformed to floating point values.
 
     Parameters
     ----------
@@ -579,29 +560,66 @@ def _process_data_var(string):
         key, values pair
     """
     key, var = string.split("<-")
-    if "structure" in var:
-        var, dim = var.replace("structure(", "").replace(",", "").split(".Dim")
-        # dtype = int if '.' not in var and 'e' not in var.lower() else float
-        dtype = float
-        var = var.replace("c(", "").replace(")", "").strip().split()
-        dim = dim.replace("=", "").replace("c(", "").replace(")", "").strip().split()
-        dim = tuple(map(int, dim))
-        var = np.fromiter(map(dtype, var), dtype).reshape(dim, order="F")
-    elif "c(" in var:
-        # dtype = int if '.' not in var and 'e' not in var.lower() else float
-        dtype = float
-        var = var.replace("c(", "").replace(")", "").split(",")
-        var = np.fromiter(map(dtype, var), dtype)
+    var = var.strip()
+    if var.startswith("structure("):
+        var, dim = var[len("structure(") : var.rindex(")")].split(".Dim")
+        dim = tuple(_parse_rdump_values(dim.strip().lstrip("=")))
+        var = _parse_rdump_values(var.strip().rstrip(",")).reshape(dim, order="F")
+    elif var.startswith("c(") or ":" in var:
+        var = _parse_rdump_values(var)
     else:
-        # dtype = int if '.' not in var and 'e' not in var.lower() else float
-        dtype = float
-        var = dtype(var)
+        var = _parse_rdump_values(var)[0].item()
     return key.strip(), var
 
 
+def _parse_rdump_values(string):
+    """Parse an Rdump vector, sequence or scalar to a 1d ndarray.
+
+    Parameters
+    ----------
+    string : str
+
+    Returns
+    -------
+    ndarray
+        int64 if all the values are integers, float64 otherwise.
+    """
+    string = string.strip()
+    if string.startswith("c(") and string.endswith(")"):
+        string = string[2:-1]
+    if ":" in string:
+        start, stop = (_strip_rdump_integer(value.strip()) for value in string.split(":"))
+        return np.arange(int(start), int(stop) + 1)
+    values = [value.strip() for value in string.split(",")]
+    if "L" in string:
+        values = [_strip_rdump_integer(value) for value in values]
+    is_float = _RDUMP_FLOAT.search(string) is not None
+    if "NA" in string:
+        values = ["nan" if value == "NA" else value for value in values]
+        is_float = True
+    dtype = np.float64 if is_float else np.int64
+    try:
+        return np.array(values, dtype=dtype)
+    except ValueError:
+        raise ValueError("Invalid Rdump values: {}".format(string[:50]))
+
+
+def _strip_rdump_integer(value):
+    """Remove the suffix of an R integer literal, e.g. 5L."""
+    match = _RDUMP_INTEGER.match(value)
+    return value if match is None else match.group(1)
+
+
+_RDUMP_INTEGER = re.compile(r"^([-+]?[0-9]+(?:[eE]\+?[0-9]+)?)L$")
+_RDUMP_FLOAT = re.compile(r"[.eEIna]")
+
+
 def _read_data(path):
     """Read Rdump output and transform to Python dictionary.
 
+    The file is read line by line. The lines of each variable are collected and
+    converted to a numpy array at once.
+
     Parameters
     ----------
     path : str
@@ -613,16 +631,16 @@ def _read_data(path):
     """
     data = {}
     with open(path, "r") as f_obj:
-        var = ""
+        var_lines = []
         for line in f_obj:
             if "<-" in line:
-                if len(var):
-                    key, var = _process_data_var(var)
+                if var_lines:
+                    key, var = _process_data_var(" ".join(var_lines))
                     data[key] = var
-                var = ""
-            var += " " + line.strip()
-        if len(var):
-            key, var = _process_data_var(var)
+                var_lines = []
+            var_lines.append(line.strip())
+        if var_lines:
+            key, var = _process_data_var(" ".join(var_lines))
             data[key] = var
     return data
 
@@ -630,6 +648,10 @@ def _read_data(path):
 def _unpack_dataframes(dfs):
     """Transform a list of pandas.DataFrames to dictionary containing ndarrays.
 
+    The values of all chains are stacked to one (chain, draw, column) array, and the
+    columns of each variable are scattered to its shape with one indexing operation,
+    using the position encoded in the column names (Stan uses column-major order).
+
     Parameters
     ----------
     dfs : List[pandas.DataFrame]
@@ -641,26 +663,31 @@ def _unpack_dataframes(dfs):
     """
     col_groups = defaultdict(list)
     columns = dfs[0].columns
-    for col in columns:
+    for col_idx, col in enumerate(columns):
         key, *loc = col.split(".")
         loc = tuple(int(i) - 1 for i in loc)
-        col_groups[key].append((col, loc))
-
-    chains = len(dfs)
-    draws = len(dfs[0])
+        col_groups[key].append((col_idx, loc))
+
+    values = np.stack(
+        [
+            (df if df.columns.equals(columns) else df[columns]).to_numpy(dtype=np.float64)
+            for df in dfs
+        ]
+    )
+    chains, draws, _ = values.shape
     sample = {}
     for key, cols_locs in col_groups.items():
-        ndim = np.array([loc for _, loc in cols_locs]).max(0) + 1
-        sample[key] = np.full((chains, draws, *ndim), np.nan)
-        for col, loc in cols_locs:
-            for chain_id, df in enumerate(dfs):
-                draw = df[col].values
-                if loc == ():
-                    sample[key][chain_id, :] = draw
-                else:
-                    axis1_all = range(sample[key].shape[1])
-                    slicer = (chain_id, axis1_all, *loc)
-                    sample[key][slicer] = draw
+        col_idxs, locs = zip(*cols_locs)
+        col_idxs = np.array(col_idxs)
+        if locs[0] == ():
+            sample[key] = values[:, :, col_idxs[0]]
+            continue
+        locs = np.array(locs)
+        shape = tuple(locs.max(0) + 1)
+        flat_idxs = np.ravel_multi_index(locs.T, shape)
+        ary = np.full((chains, draws, int(np.prod(shape))), np.nan)
+        ary[:, :, flat_idxs] = values[:, :, col_idxs]
+        sample[key] = ary.reshape((chains, draws, *shape))
     return sample
 
 
@@ -674,7 +701,8 @@ def from_cmdstan(
     observed_data_var=None,
     log_likelihood=None,
     coords=None,
-    dims=None
+    dims=None,
+    n_jobs=1
 ):
     """Convert CmdStan data into an InferenceData object.
 
@@ -708,6 +736,10 @@ def from_cmdstan(
         is the name of the dimension, the values are the index values.
     dims : dict[str, List(str)]
         A mapping from variables to a list of coordinate names for the variable.
+    n_jobs : int, optional
+        Number of processes used to read the csv files of the chains in parallel. If None,
+        uses the number of processors on the machine. Defaults to 1, which reads the files
+        one after another.
 
     Returns
     -------
@@ -723,4 +755,5 @@ def from_cmdstan(
         log_likelihood=log_likelihood,
         coords=coords,
         dims=dims,
+        n_jobs=n_jobs,
     ).to_inference_data()
@@ -10,13 +10,21 @@ class PyMC3Converter:
     """Encapsulate PyMC3 specific logic."""
 
     def __init__(
-        self, *_, trace=None, prior=None, posterior_predictive=None, coords=None, dims=None
+        self,
+        *_,
+        trace=None,
+        prior=None,
+        posterior_predictive=None,
+        coords=None,
+        dims=None,
+        log_likelihood=True
     ):
         self.trace = trace
         self.prior = prior
         self.posterior_predictive = posterior_predictive
         self.coords = coords
         self.dims = dims
+        self.log_likelihood = log_likelihood
         import pymc3
 
         self.pymc3 = pymc3
@@ -25,35 +33,52 @@ class PyMC3Converter:
     def _extract_log_likelihood(self):
         """Compute log likelihood of each observation.
 
-        Return None if there is not exactly 1 observed random variable.
+        The log likelihood of all observed random variables is evaluated for every draw of
+        a chain by a single compiled function, scanning over the stacked draws of the free
+        variables. Values of the observed variables are flattened and concatenated along
+        the last axis.
+
+        Return None if there are no observed random variables.
         """
+        import theano
+
         # This next line is brittle and may not work forever, but is a secret
         # way to access the model from the trace.
         model = self.trace._straces[0].model  # pylint: disable=protected-access
-        if len(model.observed_RVs) != 1:
+        observed = model.observed_RVs
+        if not observed:
             return None, None
-        else:
-            if self.dims is not None:
-                coord_name = self.dims.get(model.observed_RVs[0].name)
-            else:
-                coord_name = None
-
-        cached = [(var, var.logp_elemwise) for var in model.observed_RVs]
-
-        def log_likelihood_vals_point(point):
-            """Compute log likelihood for each observed point."""
-            log_like_vals = []
-            for var, log_like in cached:
-                log_like_val = log_like(point)
-                if var.missing_values:
-                    log_like_val = log_like_val[~var.observations.mask]
-                log_like_vals.append(log_like_val.ravel())
-            return np.concatenate(log_like_vals)
+        coord_name = None
+        if self.dims is not None and len(observed) == 1:
+            coord_name = self.dims.get(observed[0].name)
+
+        log_like = []
+        for var in observed:
+            log_like_var = var.logp_elemwiset.ravel()
+            if var.missing_values:
+                log_like_var = log_like_var[np.flatnonzero(~var.observations.mask)]
+            log_like.append(log_like_var)
+        log_like = theano.tensor.concatenate(log_like)
+
+        draws = [
+            theano.tensor.TensorType(var.dtype, (False,) + var.broadcastable)(var.name)
+            for var in model.vars
+        ]
+        # the stacked draws have no test values, which PyMC3 otherwise requires
+        with theano.configparser.change_flags(compute_test_value="off"):
+            log_like_draws, _ = theano.scan(
+                lambda *point: theano.clone(log_like, replace=dict(zip(model.vars, point))),
+                sequences=draws,
+            )
+            log_like_fn = theano.function(
+                draws, log_like_draws, allow_input_downcast=True, on_unused_input="ignore"
+            )
 
+        var_names = [var.name for var in model.vars]
         chain_likelihoods = []
         for chain in self.trace.chains:
-            log_like = (log_likelihood_vals_point(point) for point in self.trace.points([chain]))
-            chain_likelihoods.append(np.stack(log_like))
+            values = [self.trace.get_values(name, chains=chain) for name in var_names]
+            chain_likelihoods.append(log_like_fn(*values))
         return np.stack(chain_likelihoods), coord_name
 
     @requires("trace")
@@ -75,12 +100,12 @@ class PyMC3Converter:
         for stat in self.trace.stat_names:
             name = rename_key.get(stat, stat)
             data[name] = np.array(self.trace.get_sampler_stats(stat, combine=False))
-        log_likelihood, dims = self._extract_log_likelihood()
-        if log_likelihood is not None:
-            data["log_likelihood"] = log_likelihood
-            dims = {"log_likelihood": dims}
-        else:
-            dims = None
+        dims = None
+        if self.log_likelihood:
+            log_likelihood, log_likelihood_dims = self._extract_log_likelihood()
+            if log_likelihood is not None:
+                data["log_likelihood"] = log_likelihood
+                dims = {"log_likelihood": log_likelihood_dims}
 
         return dict_to_dataset(data, library=self.pymc3, dims=dims, coords=self.coords)
 
@@ -142,12 +167,44 @@ class PyMC3Converter:
         )
 
 
-def from_pymc3(*, trace=None, prior=None, posterior_predictive=None, coords=None, dims=None):
-    """Convert pymc3 data into an InferenceData object."""
+def from_pymc3(
+    *,
+    trace=None,
+    prior=None,
+    posterior_predictive=None,
+    coords=None,
+    dims=None,
+    log_likelihood=True
+):
+    """Convert pymc3 data into an InferenceData object.
+
+    Parameters
+    ----------
+    trace : pymc3.MultiTrace
+        Fitted PyMC3 trace.
+    prior : dict
+        Prior samples from `pymc3.sample_prior_predictive`.
+    posterior_predictive : dict
+        Posterior predictive samples from `pymc3.sample_posterior_predictive`.
+    coords : dict[str] -> list[str]
+        Map of dimensions to coordinates
+    dims : dict[str] -> list[str]
+        Map variable names to their coordinates
+    log_likelihood : bool
+        Whether to compute the pointwise log likelihood and store it in `sample_stats`.
+        The values of all the observed variables are flattened, without missing values,
+        and concatenated in a single `log_likelihood` variable. Its dimension is taken
+        from `dims` only if the model has exactly one observed variable. Defaults to True.
+
+    Returns
+    -------
+    InferenceData object
+    """
     return PyMC3Converter(
         trace=trace,
         prior=prior,
         posterior_predictive=posterior_predictive,
         coords=coords,
         dims=dims,
+        log_likelihood=log_likelihood,
     ).to_inference_data()
@@ -33,10 +33,18 @@ class PyStanConverter:
         self.log_likelihood = log_likelihood
         self.coords = coords
         self.dims = dims
+        self._metadata = {}
         import pystan
 
         self.pystan = pystan
 
+    def get_draws(self, fit, variables=None, ignore=None):
+        """Extract draws from fit, parsing the model metadata only once per fit."""
+        if id(fit) not in self._metadata:
+            self._metadata[id(fit)] = infer_metadata(fit)
+        metadata = self._metadata[id(fit)]
+        return get_draws(fit, variables=variables, ignore=ignore, metadata=metadata)
+
     @requires("posterior")
     def posterior_to_xarray(self):
         """Extract posterior samples from fit."""
@@ -55,7 +63,7 @@ class PyStanConverter:
 
         ignore = posterior_predictive + log_likelihood + ["lp__"]
 
-        data = get_draws(posterior, ignore=ignore)
+        data = self.get_draws(posterior, ignore=ignore)
 
         return dict_to_dataset(data, library=self.pystan, coords=self.coords, dims=self.dims)
 
@@ -91,7 +99,7 @@ class PyStanConverter:
         # log_likelihood
         log_likelihood = self.log_likelihood
         if log_likelihood is not None:
-            log_likelihood_data = get_draws(posterior, variables=log_likelihood)
+            log_likelihood_data = self.get_draws(posterior, variables=log_likelihood)
             data["log_likelihood"] = log_likelihood_data[log_likelihood]
             if isinstance(log_likelihood, str) and log_likelihood in dims:
                 dims["log_likelihood"] = dims.pop(log_likelihood)
@@ -99,7 +107,7 @@ class PyStanConverter:
                 coords["log_likelihood"] = coords.pop(log_likelihood)
 
         # lp__
-        stat_lp = get_draws(posterior, variables="lp__")
+        stat_lp = self.get_draws(posterior, variables="lp__")
         data["lp"] = stat_lp["lp__"]
 
         return dict_to_dataset(data, library=self.pystan, coords=coords, dims=dims)
@@ -110,7 +118,7 @@ class PyStanConverter:
         """Convert posterior_predictive samples to xarray."""
         posterior = self.posterior
         posterior_predictive = self.posterior_predictive
-        data = get_draws(posterior, variables=posterior_predictive)
+        data = self.get_draws(posterior, variables=posterior_predictive)
         return dict_to_dataset(data, library=self.pystan, coords=self.coords, dims=self.dims)
 
     @requires("prior")
@@ -126,7 +134,7 @@ class PyStanConverter:
 
         ignore = prior_predictive + ["lp__"]
 
-        data = get_draws(prior, ignore=ignore)
+        data = self.get_draws(prior, ignore=ignore)
         return dict_to_dataset(data, library=self.pystan, coords=self.coords, dims=self.dims)
 
     @requires("prior")
@@ -155,7 +163,7 @@ class PyStanConverter:
             data[name] = values
 
         # lp__
-        stat_lp = get_draws(prior, variables="lp__")
+        stat_lp = self.get_draws(prior, variables="lp__")
         data["lp"] = stat_lp["lp__"]
 
         return dict_to_dataset(data, library=self.pystan, coords=self.coords, dims=self.dims)
@@ -166,7 +174,7 @@ class PyStanConverter:
         """Convert prior_predictive samples to xarray."""
         prior = self.prior
         prior_predictive = self.prior_predictive
-        data = get_draws(prior, variables=prior_predictive)
+        data = self.get_draws(prior, variables=prior_predictive)
         return dict_to_dataset(data, library=self.pystan, coords=self.coords, dims=self.dims)
 
     @requires("posterior")
@@ -211,18 +219,35 @@ class PyStanConverter:
         )
 
 
-def get_draws(fit, variables=None, ignore=None):
-    """Extract draws from PyStan fit."""
+def get_draws(fit, variables=None, ignore=None, metadata=None):
+    """Extract draws from PyStan fit.
+
+    The flat samples of the requested variables are gathered to one
+    (chain, flat parameter, draw) array, and each variable is a reshaped view of it
+    following Stan's column-major order.
+
+    Parameters
+    ----------
+    fit : StanFit4Model
+    variables : str or list of str, optional
+        Variables to extract. Defaults to all variables of the fit.
+    ignore : list of str, optional
+        Variables to skip.
+    metadata : dict, optional
+        Output of `infer_metadata(fit)`. Pass it when extracting draws from the same fit
+        several times, so the model code and parameter names are only parsed once.
+
+    Returns
+    -------
+    OrderedDict
+        key, values pairs. Values are formatted to shape = (nchain, ndraws, *shape)
+    """
     if ignore is None:
         ignore = []
-    if fit.mode == 1:
-        msg = "Model in mode 'test_grad'. Sampling is not conducted."
-        raise AttributeError(msg)
-    elif fit.mode == 2 or fit.sim.get("samples") is None:
-        msg = "Fit doesn't contain samples."
-        raise AttributeError(msg)
-
-    dtypes = infer_dtypes(fit)
+    if metadata is None:
+        metadata = infer_metadata(fit)
+    dtypes = metadata["dtypes"]
+    var_slices = metadata["var_slices"]
 
     if variables is None:
         variables = fit.sim["pars_oi"]
@@ -235,68 +260,98 @@ def get_draws(fit, variables=None, ignore=None):
             del variables[variables.index(var)]
 
     ndraws = [s - w for s, w in zip(fit.sim["n_save"], fit.sim["warmup2"])]
-    nchain = len(fit.sim["samples"])
+    ndraw = max(ndraws)
 
-    var_keys = OrderedDict((var, []) for var in fit.sim["pars_oi"])
-    for key in fit.sim["fnames_oi"]:
-        var, *tails = key.split("[")
-        loc = [Ellipsis]
-        for tail in tails:
-            loc = []
-            for i in tail[:-1].split(","):
-                loc.append(int(i) - 1)
-        var_keys[var].append((key, loc))
+    variables = [var for var in variables if var not in ignore]
+    variables = list(OrderedDict.fromkeys(variables))
 
-    shapes = dict(zip(fit.sim["pars_oi"], fit.sim["dims_oi"]))
+    # index map of the flat parameters of the requested variables
+    keys = []
+    var_locs = OrderedDict()
+    for var in variables:
+        var_slice, shape = var_slices.get(var, (None, []))
+        flat_keys = [var] if var_slice is None else fit.sim["fnames_oi"][var_slice]
+        var_locs[var] = (slice(len(keys), len(keys) + len(flat_keys)), shape)
+        keys.extend(flat_keys)
 
-    variables = [var for var in variables if var not in ignore]
+    nchain = len(fit.sim["samples"])
+    block = np.empty((nchain, len(keys), ndraw))
+    for chain, (pyholder, chain_ndraw) in enumerate(zip(fit.sim["samples"], ndraws)):
+        np.concatenate(
+            [pyholder.chains[key][-chain_ndraw:] for key in keys], out=block[chain].reshape(-1)
+        )
 
     data = OrderedDict()
-
-    for var in variables:
-        if var in data:
-            continue
-        keys_locs = var_keys.get(var, [(var, [Ellipsis])])
-        shape = shapes.get(var, [])
-        dtype = dtypes.get(var)
-
-        ndraw = max(ndraws)
-        ary_shape = [nchain, ndraw] + shape
-        ary = np.empty(ary_shape, dtype=dtype, order="F")
-        for chain, (pyholder, ndraw) in enumerate(zip(fit.sim["samples"], ndraws)):
-            axes = [chain, slice(None)]
-            for key, loc in keys_locs:
-                ary_slice = tuple(axes + loc)
-                ary[ary_slice] = pyholder.chains[key][-ndraw:]
-        data[var] = ary
+    for var, (loc, shape) in var_locs.items():
+        ndim = len(shape)
+        # (chain, *reversed(shape), draw) -> (chain, draw, *shape)
+        ary = block[:, loc].reshape((nchain, *shape[::-1], ndraw))
+        ary = ary.transpose((0, ndim + 1, *range(ndim, 0, -1)))
+        data[var] = ary.astype(dtypes.get(var, np.float64), copy=False)
 
     return data
 
 
+def infer_metadata(fit):
+    """Parse the variable information needed to extract draws from a PyStan fit.
+
+    Parameters
+    ----------
+    fit : StanFit4Model
+
+    Returns
+    -------
+    dict
+        dtypes : dict
+            Output of `infer_dtypes(fit)`.
+        var_slices : OrderedDict
+            Maps variable names to the slice of their flat parameters in
+            `fit.sim["fnames_oi"]` and to their shape.
+    """
+    if fit.mode == 1:
+        msg = "Model in mode 'test_grad'. Sampling is not conducted."
+        raise AttributeError(msg)
+    elif fit.mode == 2 or fit.sim.get("samples") is None:
+        msg = "Fit doesn't contain samples."
+        raise AttributeError(msg)
+
+    # flat parameters of each variable are stored next to each other in fnames_oi
+    var_slices = OrderedDict()
+    start = 0
+    for var, dim in zip(fit.sim["pars_oi"], fit.sim["dims_oi"]):
+        stop = start + int(np.prod(dim))
+        var_slices[var] = (slice(start, stop), list(dim))
+        start = stop
+
+    return {"dtypes": infer_dtypes(fit), "var_slices": var_slices}
+
+
+_PATTERN_REMOVE_COMMENTS = re.compile(
+    r'//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|"(?:\\.|[^\\"])*"', re.DOTALL | re.MULTILINE
+)
+_STAN_INTEGER = r"int"
+_STAN_LIMITS = r"(?:\<[^\>]+\>)*"  # ignore group: 0 or more <....>
+_STAN_PARAM = r"([^;=\s\[]+)"  # capture group: ends= ";", "=", "[" or whitespace
+_STAN_WS = r"\s*"  # 0 or more whitespace
+_PATTERN_INT = re.compile(
+    "".join((_STAN_INTEGER, _STAN_WS, _STAN_LIMITS, _STAN_WS, _STAN_PARAM)), re.IGNORECASE
+)
+
+
 def infer_dtypes(fit):
     """Infer dtypes from Stan model code.
 
     Function strips out generated quantities block and searchs for `int`
     dtypes after stripping out comments inside the block.
     """
-    pattern_remove_comments = re.compile(
-        r'//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|"(?:\\.|[^\\"])*"', re.DOTALL | re.MULTILINE
-    )
-    stan_integer = r"int"
-    stan_limits = r"(?:\<[^\>]+\>)*"  # ignore group: 0 or more <....>
-    stan_param = r"([^;=\s\[]+)"  # capture group: ends= ";", "=", "[" or whitespace
-    stan_ws = r"\s*"  # 0 or more whitespace
-    pattern_int = re.compile(
-        "".join((stan_integer, stan_ws, stan_limits, stan_ws, stan_param)), re.IGNORECASE
-    )
     stan_code = fit.get_stancode()
     # remove deprecated comments
     stan_code = "\n".join(
         line if "#" not in line else line[: line.find("#")] for line in stan_code.splitlines()
     )
-    stan_code = re.sub(pattern_remove_comments, "", stan_code)
+    stan_code = re.sub(_PATTERN_REMOVE_COMMENTS, "", stan_code)
     stan_code = stan_code.split("generated quantities")[-1]
-    dtypes = re.findall(pattern_int, stan_code)
+    dtypes = re.findall(_PATTERN_INT, stan_code)
     dtypes = {item.strip(): "int" for item in dtypes if item.strip() in fit.model_pars}
     return dtypes
 
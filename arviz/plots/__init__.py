@@ -4,7 +4,7 @@ from .compareplot import plot_compare
 from .densityplot import plot_density
 from .energyplot import plot_energy
 from .forestplot import plot_forest
-from .kdeplot import plot_kde, _fast_kde, _fast_kde_2d
+from .kdeplot import plot_kde, kde_cache, _fast_kde, _fast_kde_2d
 from .parallelplot import plot_parallel
 from .posteriorplot import plot_posterior
 from .traceplot import plot_trace
@@ -23,6 +23,7 @@ __all__ = [
     "plot_energy",
     "plot_forest",
     "plot_kde",
+    "kde_cache",
     "_fast_kde",
     "_fast_kde_2d",
     "plot_parallel",
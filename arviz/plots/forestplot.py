@@ -7,9 +7,9 @@ import matplotlib.pyplot as plt
 
 from ..data import convert_to_dataset
 from ..stats import hpd
-from ..stats.diagnostics import _get_neff, _get_rhat
+from ..stats.diagnostics import _get_neff_batch, _get_rhat_batch
 from .plot_utils import _scale_fig_size, xarray_var_iter, make_label
-from .kdeplot import _fast_kde
+from .kdeplot import _fast_kde_rows
 from ..utils import _var_names
 
 
@@ -302,17 +302,27 @@ class PlotHandler:
         else:
             qlist = [endpoint, 50, 100 - endpoint]
 
-        for plotter in self.plotters.values():
-            for y, values, color in plotter.treeplot(qlist, credible_interval):
-                mid = len(values) // 2
-                param_iter = zip(
-                    np.linspace(2 * linewidth, linewidth, mid, endpoint=True)[-1::-1], range(mid)
+        rows = [
+            row
+            for plotter in self.plotters.values()
+            for row in plotter.treeplot(qlist, credible_interval)
+        ]
+        if rows:
+            # draw every interval width and the medians of each color with a single call
+            y_vals, values, colors = zip(*rows)
+            y_vals, values = np.array(y_vals), np.array(values)
+            mid = values.shape[1] // 2
+            param_iter = zip(
+                np.linspace(2 * linewidth, linewidth, mid, endpoint=True)[-1::-1], range(mid)
+            )
+            for width, j in param_iter:
+                ax.hlines(
+                    y_vals, values[:, j], values[:, -(j + 1)], linewidth=width, colors=list(colors)
                 )
-                for width, j in param_iter:
-                    ax.hlines(y, values[j], values[-(j + 1)], linewidth=width, color=color)
+            for color, idxs in self._group_by_color(colors):
                 ax.plot(
-                    values[mid],
-                    y,
+                    values[idxs, mid],
+                    y_vals[idxs],
                     "o",
                     mfc=ax.get_facecolor(),
                     markersize=markersize * 0.75,
@@ -327,18 +337,16 @@ class PlotHandler:
 
     def plot_neff(self, ax, xt_labelsize, titlesize, markersize):
         """Draw effective n for each plotter."""
-        for plotter in self.plotters.values():
-            for y, eff_n, color in plotter.eff_n():
-                if eff_n is not None:
-                    ax.plot(
-                        eff_n,
-                        y,
-                        "o",
-                        color=color,
-                        clip_on=False,
-                        markersize=markersize,
-                        markeredgecolor="k",
-                    )
+        for color, y_vals, eff_n in self._diagnostic_points("eff_n"):
+            ax.plot(
+                eff_n,
+                y_vals,
+                "o",
+                color=color,
+                clip_on=False,
+                markersize=markersize,
+                markeredgecolor="k",
+            )
         ax.set_xlim(left=0)
         ax.set_title("eff_n", fontsize=titlesize, wrap=True)
         ax.tick_params(labelsize=xt_labelsize)
@@ -346,16 +354,36 @@ class PlotHandler:
 
     def plot_rhat(self, ax, xt_labelsize, titlesize, markersize):
         """Draw r-hat for each plotter."""
-        for plotter in self.plotters.values():
-            for y, r_hat, color in plotter.r_hat():
-                if r_hat is not None:
-                    ax.plot(r_hat, y, "o", color=color, markersize=markersize, markeredgecolor="k")
+        for color, y_vals, r_hat in self._diagnostic_points("r_hat"):
+            ax.plot(r_hat, y_vals, "o", color=color, markersize=markersize, markeredgecolor="k")
         ax.set_xlim(left=0.9, right=2.1)
         ax.set_xticks([1, 2])
         ax.tick_params(labelsize=xt_labelsize)
         ax.set_title("r_hat", fontsize=titlesize, wrap=True)
         return ax
 
+    def _diagnostic_points(self, diagnostic):
+        """Collect the y values and values of a diagnostic of all the plotters by color."""
+        points = [
+            (color, y, value)
+            for plotter in self.plotters.values()
+            for y, value, color in getattr(plotter, diagnostic)()
+            if value is not None
+        ]
+        for color, idxs in self._group_by_color([color for color, _, _ in points]):
+            yield color, [points[idx][1] for idx in idxs], [points[idx][2] for idx in idxs]
+
+    def _group_by_color(self, colors):
+        """Group the positions in `colors` by model color, in order of first appearance.
+
+        Colors are matched against `self.colors` by equality, so any valid matplotlib color
+        works, including unhashable ones and lists mixing names with RGB tuples.
+        """
+        groups = {}
+        for idx, color in enumerate(colors):
+            groups.setdefault(self.colors.index(color), []).append(idx)
+        return [(self.colors[color_idx], idxs) for color_idx, idxs in groups.items()]
+
     def make_bands(self, ax):
         """Draw shaded horizontal bands for each plotter."""
         y_vals, y_prev, is_zero = [0], None, False
@@ -412,9 +440,16 @@ class VarHandler:
         self.chain_offset = len(data) * 0.45 / max(1, max_chains)
         self.var_offset = 1.5 * self.chain_offset
         self.group_offset = 2 * self.var_offset
+        # the rows are materialized once, every statistic is computed from them
+        self.rows = list(self._make_rows())
+        self._labels_ticks_and_vals = None
 
     def iterator(self):
         """Iterate over models and chains for each variable."""
+        return iter(self.rows)
+
+    def _make_rows(self):
+        """Yield y value, label, values and color of every model and chain of the variable."""
         if self.combined:
             grouped_data = [[(0, datum)] for datum in self.data]
             skip_dims = {"chain"}
@@ -454,6 +489,12 @@ class VarHandler:
 
     def labels_ticks_and_vals(self):
         """Get labels, ticks, values, and colors for the variable."""
+        if self._labels_ticks_and_vals is None:
+            self._labels_ticks_and_vals = self._make_labels_ticks_and_vals()
+        return self._labels_ticks_and_vals
+
+    def _make_labels_ticks_and_vals(self):
+        """Group the rows of the variable by label."""
         y_ticks = defaultdict(list)
         for y, label, vals, color in self.iterator():
             y_ticks[label].append((y, vals, color))
@@ -467,44 +508,43 @@ class VarHandler:
 
     def treeplot(self, qlist, credible_interval):
         """Get data for each treeplot for the variable."""
-        for y, _, values, color in self.iterator():
-            ntiles = np.percentile(values.flatten(), qlist)
-            ntiles[0], ntiles[-1] = hpd(values.flatten(), credible_interval)
-            yield y, ntiles, color
+        ntiles = np.empty((len(self.rows), len(qlist)))
+        for idxs, values in _stack_by_shape([values.ravel() for _, _, values, _ in self.rows]):
+            ntiles[idxs] = np.percentile(values, qlist, axis=1).T
+            ntiles[idxs, 0], ntiles[idxs, -1] = hpd(values.T, credible_interval).T
+        for (y, _, _, color), row_ntiles in zip(self.rows, ntiles):
+            yield y, row_ntiles, color
 
     def ridgeplot(self, mult):
         """Get data for each ridgeplot for the variable."""
-        xvals, yvals, pdfs, colors = [], [], [], []
-        for y, _, values, color in self.iterator():
-            yvals.append(y)
-            colors.append(color)
-            values = values.flatten()
-            density, lower, upper = _fast_kde(values)
-            xvals.append(np.linspace(lower, upper, len(density)))
-            pdfs.append(density)
-
-        scaling = max(j.max() for j in pdfs)
-        for y, x, pdf, color in zip(yvals, xvals, pdfs, colors):
+        rows = list(self.iterator())
+        kdes = _fast_kde_rows([values for _, _, values, _ in rows])
+
+        scaling = max(density.max() for density, _, _ in kdes)
+        for (y, _, _, color), (density, lower, upper) in zip(rows, kdes):
+            x = np.linspace(lower, upper, len(density))
             y = y * np.ones_like(x)
-            yield x, y, mult * pdf / scaling + y, color
+            yield x, y, mult * density / scaling + y, color
 
     def eff_n(self):
         """Get effective n data for the variable."""
-        _, y_vals, values, colors = self.labels_ticks_and_vals()
-        for y, value, color in zip(y_vals, values, colors):
-            if value.ndim != 2 or value.shape[0] < 2:
-                yield y, None, color
-            else:
-                yield y, _get_neff(value), color
+        return self._chain_diagnostic(_get_neff_batch)
 
     def r_hat(self):
         """Get rhat data for the variable."""
+        return self._chain_diagnostic(_get_rhat_batch)
+
+    def _chain_diagnostic(self, func):
+        """Compute func on all the labels with multiple chains at once."""
         _, y_vals, values, colors = self.labels_ticks_and_vals()
-        for y, value, color in zip(y_vals, values, colors):
-            if value.ndim != 2 or value.shape[0] < 2:
-                yield y, None, color
-            else:
-                yield y, _get_rhat(value), color
+        diagnostics = [None] * len(values)
+        multichain = [
+            idx for idx, value in enumerate(values) if value.ndim == 2 and value.shape[0] >= 2
+        ]
+        for idxs, stacked in _stack_by_shape([values[idx] for idx in multichain]):
+            for idx, diagnostic in zip(np.asarray(multichain)[idxs], func(stacked)):
+                diagnostics[idx] = diagnostic
+        return zip(y_vals, diagnostics, colors)
 
     def y_max(self):
         """Get max y value for the variable."""
@@ -514,3 +554,20 @@ class VarHandler:
             end_y += self.group_offset
 
         return end_y + 2 * self.group_offset
+
+
+def _stack_by_shape(arrays):
+    """Group arrays with the same shape and stack each group.
+
+    Yields
+    ------
+    idxs : np.array
+        Positions in arrays of the members of the group
+    stacked : np.array
+        Members of the group stacked along a new first axis
+    """
+    groups = defaultdict(list)
+    for idx, array in enumerate(arrays):
+        groups[array.shape].append(idx)
+    for idxs in groups.values():
+        yield np.array(idxs), np.stack([arrays[idx] for idx in idxs])
@@ -1,9 +1,11 @@
 """One-dimensional kernel density estimate plots."""
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+import hashlib
+
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.signal import gaussian, convolve, convolve2d  # pylint: disable=no-name-in-module
-from scipy.sparse import coo_matrix
-from scipy.stats import entropy
 
 from .plot_utils import _scale_fig_size
 
@@ -177,33 +179,55 @@ def plot_kde(
         if label:
             ax.legend()
     else:
-        if contour_kwargs is None:
-            contour_kwargs = {}
-        contour_kwargs.setdefault("colors", "0.5")
-
-        gridsize = (128, 128) if contour else (256, 256)
+        gridsize = _kde_2d_gridsize(contour)
 
         density, xmin, xmax, ymin, ymax = _fast_kde_2d(values, values2, gridsize=gridsize)
-        g_s = complex(gridsize[0])
-        x_x, y_y = np.mgrid[xmin:xmax:g_s, ymin:ymax:g_s]
-
-        ax.grid(False)
-        ax.set_xlim(xmin, xmax)
-        ax.set_ylim(ymin, ymax)
-        if contour:
-            qcfs = ax.contourf(x_x, y_y, density, antialiased=True)
-            if not fill_last:
-                qcfs.collections[0].set_alpha(0)
-            qcs = ax.contour(x_x, y_y, density, **contour_kwargs)
-            if not fill_last:
-                qcs.collections[0].set_alpha(0)
-        else:
-            ax.pcolormesh(x_x, y_y, density)
+        _plot_kde_2d(
+            density,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            contour=contour,
+            fill_last=fill_last,
+            contour_kwargs=contour_kwargs,
+            ax=ax,
+        )
 
     return ax
 
 
-def _fast_kde(x, cumulative=False, bw=4.5):
+def _kde_2d_gridsize(contour):
+    """Grid used for 2D KDE plots, finer for smooth plots than for contours."""
+    return (128, 128) if contour else (256, 256)
+
+
+def _plot_kde_2d(
+    density, xmin, xmax, ymin, ymax, contour=True, fill_last=True, contour_kwargs=None, ax=None
+):
+    """Draw a gridded 2D KDE, as returned by `_fast_kde_2d`, with contours or a color mesh."""
+    if contour_kwargs is None:
+        contour_kwargs = {}
+    contour_kwargs.setdefault("colors", "0.5")
+
+    n_x, n_y = density.shape
+    x_x, y_y = np.mgrid[xmin : xmax : complex(n_x), ymin : ymax : complex(n_y)]
+
+    ax.grid(False)
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    if contour:
+        qcfs = ax.contourf(x_x, y_y, density, antialiased=True)
+        if not fill_last:
+            qcfs.collections[0].set_alpha(0)
+        qcs = ax.contour(x_x, y_y, density, **contour_kwargs)
+        if not fill_last:
+            qcs.collections[0].set_alpha(0)
+    else:
+        ax.pcolormesh(x_x, y_y, density)
+
+
+def _fast_kde(x, cumulative=False, bw=4.5, gridsize=None):
     """Fast Fourier transform-based Gaussian kernel density estimate (KDE).
 
     The code was adapted from https://github.com/mfouesneau/faststats
@@ -217,6 +241,10 @@ def _fast_kde(x, cumulative=False, bw=4.5):
         Bandwidth scaling factor for the KDE. Should be larger than 0. The higher this number the
         smoother the KDE will be. Defaults to 4.5 which is essentially the same as the Scott's rule
         of thumb (the default rule used by SciPy).
+    gridsize : int, optional
+        Number of points of the grid the density is evaluated on. The bandwidth does not depend
+        on it, so larger values give finer estimates at little cost. Defaults to a rule based on
+        the number of samples and the bandwidth, capped at 200 points.
 
     Returns
     -------
@@ -224,36 +252,219 @@ def _fast_kde(x, cumulative=False, bw=4.5):
     xmin: minimum value of x
     xmax: maximum value of x
     """
-    x = np.asarray(x, dtype=float)
-    x = x[np.isfinite(x)]
-    len_x = len(x)
-    xmin, xmax = np.min(x), np.max(x)
+    x = np.ravel(np.asarray(x, dtype=float))
+    if _KDE_CACHE is not None:
+        key = (
+            hashlib.sha1(np.ascontiguousarray(x).data).hexdigest(),
+            len(x),
+            cumulative,
+            bw,
+            gridsize,
+        )
+        cached = _KDE_CACHE.get(key)
+        if cached is not None:
+            density, xmin, xmax = cached
+            return density.copy(), xmin, xmax
+
+    density, xmin, xmax = _fast_kde_batch(x, cumulative=cumulative, bw=bw, gridsize=gridsize)
+    density, xmin, xmax = density[0], xmin[0], xmax[0]
+    if _KDE_CACHE is not None:
+        _KDE_CACHE.put(key, (density.copy(), xmin, xmax), density.nbytes)
+    return density, xmin, xmax
 
-    std_x = entropy(x - xmin) * bw
 
-    n_bins = min(int(len_x ** (1 / 3) * std_x * 2), 200)
-    grid, _ = np.histogram(x, bins=n_bins)
-    d_x = (xmax - xmin) / (n_bins - 1)
+_KDE_CACHE = None
 
-    scotts_factor = len_x ** (-0.2)
-    kern_nx = int(scotts_factor * 2 * np.pi * std_x)
-    kernel = gaussian(kern_nx, scotts_factor * std_x)
 
-    npad = min(n_bins, 2 * kern_nx)
-    grid = np.concatenate([grid[npad:0:-1], grid, grid[n_bins : n_bins - npad : -1]])
-    density = convolve(grid, kernel, mode="same")[npad : npad + n_bins]
+@contextmanager
+def kde_cache(max_bytes=2 ** 26):
+    """Reuse kernel density estimates of identical data within a block of plots.
+
+    Inside the block, the densities computed by the 1D KDEs of `plot_trace`, `plot_posterior`,
+    `plot_density`, `plot_forest`, `plot_violin` and `plot_kde` are memoized. They are keyed by a
+    hash of the data and the KDE options, so later plots of the same variables reuse them. When
+    the densities exceed `max_bytes`, the least recently used ones are discarded. Nested blocks
+    share the cache of the outermost one.
+
+    Examples
+    --------
+    .. code:: ipython
+
+        >>> with az.kde_cache():
+        ...     az.plot_trace(data)
+        ...     az.plot_posterior(data)
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget of the cached densities, in bytes. Defaults to 64 MiB.
+
+    Yields
+    ------
+    The cache object, which supports `len` and `clear`.
+    """
+    global _KDE_CACHE  # pylint: disable=global-statement
+    previous = _KDE_CACHE
+    if previous is None:
+        _KDE_CACHE = _LRUCache(max_bytes)
+    try:
+        yield _KDE_CACHE
+    finally:
+        _KDE_CACHE = previous
+
+
+class _LRUCache:
+    """Mapping keeping the most recently used values within a memory budget."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        """Return the value stored for `key`, or None, and mark it as recently used."""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key][0]
+
+    def put(self, key, value, nbytes):
+        """Store `value`, discarding the least recently used values if over budget."""
+        if key in self._data or nbytes > self.max_bytes:
+            return
+        self._data[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, old_nbytes) = self._data.popitem(last=False)
+            self.nbytes -= old_nbytes
+
+    def clear(self):
+        """Discard all values."""
+        self._data.clear()
+        self.nbytes = 0
+
+
+def _fast_kde_batch(x, cumulative=False, bw=4.5, gridsize=None):
+    """Gaussian kernel density estimates of many series at once.
+
+    Vectorized counterpart of `_fast_kde`: every row of `x` is binned on its own grid in a single
+    pass and smoothed by fft convolution along the grid axis. All densities share the number of
+    grid points, so they are returned stacked. Non-finite values are ignored.
+
+    Parameters
+    ----------
+    x : 2D Numpy array
+        Array of shape (series, samples)
+    cumulative : bool
+        If true, estimate the cdf instead of the pdf
+    bw : float
+        Bandwidth scaling factor for the KDE. See `_fast_kde`.
+    gridsize : int, optional
+        Number of grid points shared by all densities. See `_fast_kde`.
+
+    Returns
+    -------
+    density: 2D array of shape (series, grid points), with one KDE per series
+    xmin: 1D array with the minimum value of each series
+    xmax: 1D array with the maximum value of each series
+    """
+    x = np.array(x, dtype=float, ndmin=2)
+    finite = np.isfinite(x)
+    len_x = finite.sum(axis=1)
+    x = np.where(finite, x, np.nan)
+    xmin, xmax = np.nanmin(x, axis=1), np.nanmax(x, axis=1)
+
+    # bandwidth from the entropy of each shifted series, as in scipy.stats.entropy
+    probs = x - xmin[:, None]
+    probs /= np.nansum(probs, axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std_x = -np.nansum(np.where(probs > 0, probs * np.log(probs), 0), axis=1) * bw
+
+    series_bins = np.minimum((len_x ** (1 / 3) * std_x * 2).astype(int), 200)
+    n_bins = series_bins.max() if gridsize is None else gridsize
+    d_x = (xmax - xmin) / (n_bins - 1)
 
-    norm_factor = len_x * d_x * (2 * np.pi * std_x ** 2 * scotts_factor ** 2) ** 0.5
+    # bin every series on its own grid, then count all of them with one bincount
+    bin_idx = np.floor((x - xmin[:, None]) / (xmax - xmin)[:, None] * n_bins)
+    bin_idx = np.clip(np.nan_to_num(bin_idx), 0, n_bins - 1).astype(int)
+    bin_idx += np.arange(len(x))[:, None] * n_bins
+    grid = np.bincount(bin_idx[finite], minlength=len(x) * n_bins).reshape(len(x), n_bins)
 
-    density = density / norm_factor
+    # kernel width in data units follows each series' own grid, express it in shared grid bins
+    scotts_factor = len_x ** (-0.2)
+    sigma = scotts_factor * std_x * (n_bins - 1) / (series_bins - 1)
+    density = _gaussian_smooth(grid, sigma) / (len_x * d_x)[:, None]
 
     if cumulative:
-        cs_density = np.cumsum(density)
-        density = cs_density / cs_density[-1]
+        cs_density = np.cumsum(density, axis=1)
+        density = cs_density / cs_density[:, -1:]
 
     return density, xmin, xmax
 
 
+def _fast_kde_rows(rows, bw=4.5):
+    """Gaussian kernel density estimates of several series, as (density, xmin, xmax) per series.
+
+    Series of the same length are estimated together by `_fast_kde_batch`, so their densities
+    share the grid size of the widest one. Inside a `kde_cache` block every series goes through
+    `_fast_kde` instead, to share the densities with the other plots.
+    """
+    rows = [np.ravel(row) for row in rows]
+    if _KDE_CACHE is not None:
+        return [_fast_kde(row, bw=bw) for row in rows]
+    kdes = [None] * len(rows)
+    lengths = [len(row) for row in rows]
+    for length in set(lengths):
+        idxs = [idx for idx, row_length in enumerate(lengths) if row_length == length]
+        density, xmin, xmax = _fast_kde_batch([rows[idx] for idx in idxs], bw=bw)
+        for idx, kde in zip(idxs, zip(density, xmin, xmax)):
+            kdes[idx] = kde
+    return kdes
+
+
+def _gaussian_smooth(grid, sigma):
+    """Convolve each row of `grid` with a normalized Gaussian of width `sigma` (in bins).
+
+    Rows are reflected at both ends before the fft convolution, so mass is not lost at the
+    boundaries.
+    """
+    n_bins = grid.shape[1]
+    npad = min(n_bins - 1, int(np.ceil(6 * np.max(sigma))))
+    padded = np.pad(grid, ((0, 0), (npad, npad)), mode="reflect")
+    n_fft = 2 ** int(np.ceil(np.log2(padded.shape[1])))
+    sigma = np.ravel(sigma)
+    if sigma.size == 1:
+        kernel_ft = _gaussian_kernel_ft(float(sigma[0]), n_fft)
+    else:
+        # the widths of a batch hardly ever repeat, caching them would only hold on to memory
+        kernel_ft = _gaussian_kernels_ft(sigma, n_fft)
+    smooth = np.fft.irfft(np.fft.rfft(padded, n_fft, axis=1) * kernel_ft, n_fft, axis=1)
+    return smooth[:, npad : npad + n_bins]
+
+
+def _gaussian_kernels_ft(sigma, n_fft):
+    """Fourier transform of normalized Gaussian kernels, one row per width in `sigma`."""
+    freqs = np.fft.rfftfreq(n_fft)
+    return np.exp(-2 * (np.pi * freqs[None, :] * np.asarray(sigma)[:, None]) ** 2)
+
+
+@lru_cache(maxsize=64)
+def _gaussian_kernel_ft(sigma, n_fft):
+    """Fourier transform of a single normalized Gaussian kernel of width `sigma`.
+
+    Cached, so repeated estimates of a series with the same bandwidth and grid size reuse it.
+    """
+    kernel_ft = _gaussian_kernels_ft([sigma], n_fft)
+    kernel_ft.flags.writeable = False
+    return kernel_ft
+
+
 def _fast_kde_2d(x, y, gridsize=(128, 128), circular=False):
     """
     2D fft-based Gaussian kernel density estimate (KDE).
@@ -276,50 +487,96 @@ def _fast_kde_2d(x, y, gridsize=(128, 128), circular=False):
     ymin: minimum value of y
     ymax: maximum value of y
     """
-    x = np.asarray(x, dtype=float)
-    x = x[np.isfinite(x)]
-    y = np.asarray(y, dtype=float)
-    y = y[np.isfinite(y)]
+    grid, xmin, xmax, ymin, ymax = _fast_kde_2d_batch(
+        np.ravel(x), np.ravel(y), gridsize=gridsize, circular=circular
+    )
+    return grid[0], xmin[0], xmax[0], ymin[0], ymax[0]
 
-    xmin, xmax = x.min(), x.max()
-    ymin, ymax = y.min(), y.max()
 
-    len_x = len(x)
-    weights = np.ones(len_x)
-    n_x, n_y = gridsize
-
-    d_x = (xmax - xmin) / (n_x - 1)
-    d_y = (ymax - ymin) / (n_y - 1)
+def _fast_kde_2d_batch(x, y, gridsize=(128, 128), circular=False):
+    """2D Gaussian kernel density estimates of many pairs of series at once.
 
-    xyi = np.vstack((x, y)).T
-    xyi -= [xmin, ymin]
-    xyi /= [d_x, d_y]
-    xyi = np.floor(xyi, xyi).T
+    Vectorized counterpart of `_fast_kde_2d`. Every pair of rows of `x` and `y` is binned on its
+    own grid with a single bincount, then smoothed by fft convolution with a Gaussian whose
+    covariance follows Scott's rule. Points where either `x` or `y` is not finite are ignored.
 
-    scotts_factor = len_x ** (-1 / 6)
-    cov = np.cov(xyi)
-    std_devs = np.diag(cov ** 0.5)
-    kern_nx, kern_ny = np.round(scotts_factor * 2 * np.pi * std_devs)
-
-    inv_cov = np.linalg.inv(cov * scotts_factor ** 2)
-
-    x_x = np.arange(kern_nx) - kern_nx / 2
-    y_y = np.arange(kern_ny) - kern_ny / 2
-    x_x, y_y = np.meshgrid(x_x, y_y)
+    Parameters
+    ----------
+    x : 2D Numpy array
+        Array of shape (series, samples)
+    y : 2D Numpy array
+        Array with the same shape as `x`
+    gridsize : tuple
+        Number of points used to discretize data. Use powers of 2 for fft optimization
+    circular: bool
+        If True, use circular boundaries, otherwise the data is reflected at the boundaries.
+        Defaults to False
 
-    kernel = np.vstack((x_x.flatten(), y_y.flatten()))
-    kernel = np.dot(inv_cov, kernel) * kernel
-    kernel = np.exp(-kernel.sum(axis=0) / 2)
-    kernel = kernel.reshape((int(kern_ny), int(kern_nx)))
+    Returns
+    -------
+    grid: 3D array of shape (series, *gridsize), with one 2D KDE per pair of series
+    xmin: 1D array with the minimum value of each series of x
+    xmax: 1D array with the maximum value of each series of x
+    ymin: 1D array with the minimum value of each series of y
+    ymax: 1D array with the maximum value of each series of y
+    """
+    x = np.array(x, dtype=float, ndmin=2)
+    y = np.array(y, dtype=float, ndmin=2)
+    finite = np.isfinite(x) & np.isfinite(y)
+    len_x = finite.sum(axis=1)
+    x = np.where(finite, x, np.nan)
+    y = np.where(finite, y, np.nan)
 
-    boundary = "wrap" if circular else "symm"
+    xmin, xmax = np.nanmin(x, axis=1), np.nanmax(x, axis=1)
+    ymin, ymax = np.nanmin(y, axis=1), np.nanmax(y, axis=1)
 
-    grid = coo_matrix((weights, xyi), shape=(n_x, n_y)).toarray()
-    grid = convolve2d(grid, kernel, mode="same", boundary=boundary)
+    n_series = len(x)
+    n_x, n_y = gridsize
+    d_x = (xmax - xmin) / (n_x - 1)
+    d_y = (ymax - ymin) / (n_y - 1)
 
-    norm_factor = np.linalg.det(2 * np.pi * cov * scotts_factor ** 2)
-    norm_factor = len_x * d_x * d_y * norm_factor ** 0.5
+    x_idx = np.nan_to_num(np.floor((x - xmin[:, None]) / d_x[:, None])).astype(int)
+    y_idx = np.nan_to_num(np.floor((y - ymin[:, None]) / d_y[:, None])).astype(int)
+    flat_idx = (np.arange(n_series)[:, None] * n_x + x_idx) * n_y + y_idx
+    grid = np.bincount(flat_idx[finite], minlength=n_series * n_x * n_y)
+    grid = grid.reshape(n_series, n_x, n_y)
 
-    grid /= norm_factor
+    # covariance of the binned points, in grid units, scaled by Scott's factor
+    x_idx = np.where(finite, x_idx - (x_idx * finite).sum(axis=1)[:, None] / len_x[:, None], 0)
+    y_idx = np.where(finite, y_idx - (y_idx * finite).sum(axis=1)[:, None] / len_x[:, None], 0)
+    scotts_factor = len_x ** (-1 / 6)
+    scale = scotts_factor ** 2 / (len_x - 1)
+    cov_xx = (x_idx ** 2).sum(axis=1) * scale
+    cov_yy = (y_idx ** 2).sum(axis=1) * scale
+    cov_xy = (x_idx * y_idx).sum(axis=1) * scale
+
+    if circular:
+        pad_x = pad_y = 0
+        n_fft_x, n_fft_y = n_x, n_y
+    else:
+        pad_x = min(n_x - 1, int(np.ceil(6 * np.sqrt(cov_xx.max()))))
+        pad_y = min(n_y - 1, int(np.ceil(6 * np.sqrt(cov_yy.max()))))
+        grid = np.pad(grid, ((0, 0), (pad_x, pad_x), (pad_y, pad_y)), mode="symmetric")
+        n_fft_x = 2 ** int(np.ceil(np.log2(n_x + 2 * pad_x)))
+        n_fft_y = 2 ** int(np.ceil(np.log2(n_y + 2 * pad_y)))
+
+    freq_x = np.fft.fftfreq(n_fft_x)[None, :, None]
+    freq_y = np.fft.rfftfreq(n_fft_y)[None, None, :]
+    kernel_ft = np.exp(
+        -2
+        * np.pi ** 2
+        * (
+            cov_xx[:, None, None] * freq_x ** 2
+            + 2 * cov_xy[:, None, None] * freq_x * freq_y
+            + cov_yy[:, None, None] * freq_y ** 2
+        )
+    )
+    shape = (n_fft_x, n_fft_y)
+    grid = np.fft.irfft2(np.fft.rfft2(grid, shape, axes=(1, 2)) * kernel_ft, shape, axes=(1, 2))
+    grid = grid[:, pad_x : pad_x + n_x, pad_y : pad_y + n_y]
+    # remove the fft round-off noise far from the data, which would show up as contours
+    grid[grid < 1e-10 * grid.max(axis=(1, 2), keepdims=True)] = 0
+
+    grid /= (len_x * d_x * d_y)[:, None, None]
 
     return grid, xmin, xmax, ymin, ymax
@@ -5,8 +5,8 @@ from matplotlib.ticker import NullFormatter
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 from ..data import convert_to_dataset
-from .kdeplot import plot_kde
-from .plot_utils import _scale_fig_size, xarray_to_ndarray, get_coords
+from .kdeplot import plot_kde, _fast_kde_2d_batch, _kde_2d_gridsize, _plot_kde_2d
+from .plot_utils import _scale_fig_size, xarray_to_ndarray, get_coords, _histogram_2d_batch
 from ..utils import _var_names
 
 
@@ -43,13 +43,17 @@ def plot_pair(
     textsize: int
         Text size for labels. If None it will be autoscaled based on figsize.
     kind : str
-        Type of plot to display (kde or hexbin)
+        Type of plot to display (scatter, kde, hexbin or raster). raster bins the samples of every
+        pair of variables into a 2D histogram drawn as a single image, which scales to millions
+        of samples.
     gridsize : int or (int, int), optional
-        Only works for kind=hexbin.
+        Only works for kind=hexbin and kind=raster.
         The number of hexagons in the x-direction. The corresponding number of hexagons in the
         y-direction is chosen such that the hexagons are approximately regular.
         Alternatively, gridsize can be a tuple with two elements specifying the number of hexagons
         in the x-direction and the y-direction.
+        For kind=raster it is the number of bins in both directions, or in the x-direction and the
+        y-direction if a tuple. "auto" uses the square root of the number of samples, up to 128.
     contour : bool
         If True plot the 2D KDE using contours, otherwise plot a smooth 2D KDE. Defaults to True.
     fill_last : bool
@@ -64,14 +68,14 @@ def plot_pair(
     divergences_kwargs : dicts, optional
         Additional keywords passed to ax.scatter for divergences
     plot_kwargs : dicts, optional
-        Additional keywords passed to ax.plot, az.plot_kde or ax.hexbin
+        Additional keywords passed to ax.plot, az.plot_kde, ax.hexbin or ax.imshow
     Returns
     -------
     ax : matplotlib axes
     """
     var_names = _var_names(var_names)
 
-    valid_kinds = ["scatter", "kde", "hexbin"]
+    valid_kinds = ["scatter", "kde", "hexbin", "raster"]
     if kind not in valid_kinds:
         raise ValueError(
             ("Plot type {} not recognized." "Plot type must be in {}").format(kind, valid_kinds)
@@ -110,7 +114,12 @@ def plot_pair(
         diverging_mask = np.squeeze(diverging_mask)
 
     if gridsize == "auto":
-        gridsize = int(len(_posterior[0]) ** 0.35)
+        if kind == "raster":
+            gridsize = min(int(len(_posterior[0]) ** 0.5), 128)
+        else:
+            gridsize = int(len(_posterior[0]) ** 0.35)
+    if kind == "raster":
+        raster_bins = (gridsize, gridsize) if np.ndim(gridsize) == 0 else tuple(gridsize)
 
     numvars = len(flat_var_names)
 
@@ -127,6 +136,9 @@ def plot_pair(
 
         if kind == "scatter":
             ax.plot(_posterior[0], _posterior[1], **plot_kwargs)
+        elif kind == "raster":
+            histogram = _histogram_2d_batch(_posterior[0], _posterior[1], raster_bins)
+            _plot_raster(*[hist[0] for hist in histogram], ax=ax, **plot_kwargs)
         elif kind == "kde":
             plot_kde(
                 _posterior[0],
@@ -167,6 +179,27 @@ def plot_pair(
             )
         axs = []
         hexbin_values = []
+        # pairs of rows of _posterior, in the order they are drawn below
+        pairs = [(i, j + 1) for i in range(0, numvars - 1) for j in range(i, numvars - 1)]
+        n_samples = len(_posterior[0])
+        if kind == "kde":
+            kde_gridsize = _kde_2d_gridsize(contour)
+            # the padded fft grids take up to 4 times the points of the density grid
+            densities = _iter_pairs(
+                _fast_kde_2d_batch,
+                _posterior,
+                pairs,
+                pair_size=n_samples + 4 * np.prod(kde_gridsize),
+                gridsize=kde_gridsize,
+            )
+        elif kind == "raster":
+            histograms = _iter_pairs(
+                _histogram_2d_batch,
+                _posterior,
+                pairs,
+                pair_size=n_samples + np.prod(raster_bins),
+                bins=raster_bins,
+            )
         for i in range(0, numvars - 1):
             var1 = _posterior[i]
 
@@ -181,10 +214,17 @@ def plot_pair(
                     ax[j, i].plot(var1, var2, **plot_kwargs)
 
                 elif kind == "kde":
-                    plot_kde(
-                        var1, var2, contour=contour, fill_last=fill_last, ax=ax[j, i], **plot_kwargs
+                    _plot_kde_2d(
+                        *next(densities),
+                        contour=contour,
+                        fill_last=fill_last,
+                        ax=ax[j, i],
+                        **plot_kwargs
                     )
 
+                elif kind == "raster":
+                    _plot_raster(*next(histograms), ax=ax[j, i], **plot_kwargs)
+
                 else:
                     ax[j, i].grid(False)
                     hexbin = ax[j, i].hexbin(var1, var2, mincnt=1, gridsize=gridsize, **plot_kwargs)
@@ -219,3 +259,45 @@ def plot_pair(
                 axs.append(ax)
 
     return axs
+
+
+def _iter_pairs(func, values, pairs, pair_size, max_size=2 ** 22, **kwargs):
+    """Apply a batched 2D estimate to pairs of rows of `values`, a chunk of pairs at a time.
+
+    Parameters
+    ----------
+    func : callable
+        Batched estimate, called as `func(x, y, **kwargs)` with one pair per row of `x` and `y`.
+        It returns arrays with one item per pair
+    values : np.array
+        2d array with one variable per row
+    pairs : list of (int, int)
+        Rows of `values` used as x and as y by every pair
+    pair_size : int
+        Number of array elements needed to estimate one pair
+    max_size : int
+        Maximum number of array elements estimated at once, pairs are processed in chunks
+
+    Yields
+    ------
+    tuple
+        The items returned by `func` for every pair, in the order of `pairs`
+    """
+    chunk = max(max_size // pair_size, 1)
+    for start in range(0, len(pairs), chunk):
+        x_rows, y_rows = zip(*pairs[start : start + chunk])
+        yield from zip(*func(values[list(x_rows)], values[list(y_rows)], **kwargs))
+
+
+def _plot_raster(counts, xmin, xmax, ymin, ymax, ax, **kwargs):
+    """Draw a 2D histogram as an image, leaving empty bins blank."""
+    kwargs.setdefault("interpolation", "nearest")
+    ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        origin="lower",
+        extent=(xmin, xmax, ymin, ymax),
+        aspect="auto",
+        **kwargs
+    )
+    ax.grid(False)
+    return ax
@@ -1,5 +1,6 @@
 """Parallel coordinates plot showing posterior points with and without divergences marked."""
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 import numpy as np
 
 from ..data import convert_to_dataset
@@ -18,6 +19,8 @@ def plot_parallel(
     colord="C1",
     shadend=0.025,
     ax=None,
+    kind="lines",
+    gridsize=(64, 256),
 ):
     """
     Plot parallel coordinates plot showing posterior points with and without divergences.
@@ -50,11 +53,23 @@ def plot_parallel(
         Defaults to .025
     ax : axes
         Matplotlib axes.
+    kind : str
+        How to draw the non-divergent samples, either "lines" (one line per sample) or "raster".
+        raster bins the lines into a single image whose opacity matches that of the overlapping
+        lines, which scales to millions of samples. Divergent samples are always drawn as lines.
+    gridsize : (int, int)
+        Only works for kind=raster. Number of image columns between consecutive variables and
+        number of image rows. Defaults to (64, 256).
 
     Returns
     -------
     ax : matplotlib axes
     """
+    if kind not in ("lines", "raster"):
+        raise ValueError(
+            "Plot type {} not recognized. Plot type must be lines or raster".format(kind)
+        )
+
     var_names = _var_names(var_names)
 
     if coords is None:
@@ -79,7 +94,21 @@ def plot_parallel(
     if ax is None:
         _, ax = plt.subplots(figsize=figsize)
 
-    ax.plot(_posterior[:, ~diverging_mask], color=colornd, alpha=shadend)
+    if kind == "raster":
+        if not np.all(diverging_mask):
+            counts, (ymin, ymax) = _parallel_counts(_posterior[:, ~diverging_mask], gridsize)
+            image = np.empty(counts.shape + (4,))
+            image[...] = to_rgba(colornd)
+            image[..., 3] *= 1 - (1 - shadend) ** counts
+            ax.imshow(
+                image,
+                origin="lower",
+                extent=(0, len(var_names) - 1, ymin, ymax),
+                aspect="auto",
+                interpolation="nearest",
+            )
+    else:
+        ax.plot(_posterior[:, ~diverging_mask], color=colornd, alpha=shadend)
 
     if np.any(diverging_mask):
         ax.plot(_posterior[:, diverging_mask], color=colord, lw=1)
@@ -95,3 +124,47 @@ def plot_parallel(
         ax.legend(fontsize=xt_labelsize)
 
     return ax
+
+
+def _parallel_counts(values, gridsize, max_size=2 ** 22):
+    """Count the lines of a parallel coordinates plot crossing every pixel of an image.
+
+    Parameters
+    ----------
+    values : np.array
+        2d array with one variable per row and one sample per column
+    gridsize : (int, int)
+        Number of image columns between consecutive variables and number of image rows
+    max_size : int
+        Maximum number of line points binned at once, samples are processed in chunks
+
+    Returns
+    -------
+    counts : np.array
+        2d array of counts with shape (rows, columns * (len(values) - 1))
+    ylim : (float, float)
+        Range of the image along y
+    """
+    columns, rows = gridsize
+    # lines through missing values are not drawn
+    values = values[:, np.isfinite(values).all(axis=0)]
+    ymin, ymax = (values.min(), values.max()) if values.size else (0, 0)
+    if ymin == ymax:
+        ymin, ymax = ymin - 0.5, ymax + 0.5
+    # work in units of image rows, so every line point only needs to be truncated to its bin
+    values = (values - ymin) * (rows / (ymax - ymin))
+    position = (np.arange(columns) + 0.5) / columns
+    offset = rows * np.arange(columns)[:, None]
+    chunk = max(max_size // columns, 1)
+
+    counts = np.zeros((columns * (len(values) - 1), rows))
+    for idx, (start, end) in enumerate(zip(values[:-1], values[1:])):
+        segment_counts = counts[idx * columns : (idx + 1) * columns].reshape(-1)
+        for low in range(0, values.shape[1], chunk):
+            lines = position[:, None] * (end - start)[low : low + chunk]
+            lines += start[low : low + chunk]
+            np.minimum(lines, rows - 1, out=lines)
+            bins = lines.astype(np.intp)
+            bins += offset
+            segment_counts += np.bincount(bins.ravel(), minlength=columns * rows)
+    return counts.T, (ymin, ymax)
@@ -168,6 +168,53 @@ def _create_axes_grid(length_plotters, rows, cols, **kwargs):
     return fig, ax
 
 
+def _histogram_2d_batch(x, y, bins, ranges=None):
+    """Compute the 2D histograms of several pairs of arrays with a single bincount.
+
+    Parameters
+    ----------
+    x, y : np.array
+        2d arrays with one pair of samples per row
+    bins : (int, int)
+        Number of bins along x and along y
+    ranges : ((float, float), (float, float)), optional
+        Ranges of x and y shared by all the histograms, samples outside them are ignored.
+        Defaults to the range of each row
+
+    Returns
+    -------
+    counts : np.array
+        3d array of counts with shape (len(x), y bins, x bins)
+    xmin, xmax, ymin, ymax : np.array
+        Edges of every histogram
+    """
+    x, y = np.atleast_2d(x), np.atleast_2d(y)
+    n_hist = len(x)
+    xbins, ybins = bins
+
+    if ranges is None:
+        xmin, xmax = np.nanmin(x, axis=1), np.nanmax(x, axis=1)
+        ymin, ymax = np.nanmin(y, axis=1), np.nanmax(y, axis=1)
+    else:
+        xmin, xmax, ymin, ymax = np.repeat(np.ravel(ranges)[:, None], n_hist, axis=1)
+    xmin, xmax, ymin, ymax = [lim.astype(float) for lim in (xmin, xmax, ymin, ymax)]
+    for low, high in ((xmin, xmax), (ymin, ymax)):
+        constant = low == high
+        low[constant] -= 0.5
+        high[constant] += 0.5
+
+    inside = (x >= xmin[:, None]) & (x <= xmax[:, None])
+    inside &= (y >= ymin[:, None]) & (y <= ymax[:, None])
+    x_ix = np.where(inside, (x - xmin[:, None]) / (xmax - xmin)[:, None] * xbins, 0).astype(int)
+    y_ix = np.where(inside, (y - ymin[:, None]) / (ymax - ymin)[:, None] * ybins, 0).astype(int)
+    flat_ix = np.minimum(y_ix, ybins - 1) * xbins + np.minimum(x_ix, xbins - 1)
+    flat_ix += xbins * ybins * np.arange(n_hist)[:, None]
+    counts = np.bincount(
+        flat_ix.ravel(), weights=inside.ravel(), minlength=n_hist * xbins * ybins
+    ).reshape(n_hist, ybins, xbins)
+    return counts, xmin, xmax, ymin, ymax
+
+
 def selection_to_string(selection):
     """Convert dictionary of coordinates to a string for labels.
 
@@ -247,7 +294,7 @@ def xarray_var_iter(data, var_names=None, combined=False, skip_dims=None, revers
     if combined:
         skip_dims = skip_dims.union({"chain", "draw"})
     else:
-        skip_dims.add("draw")
+        skip_dims = skip_dims.union({"draw"})
 
     if var_names is None:
         if isinstance(data, xr.Dataset):
@@ -258,14 +305,13 @@ def xarray_var_iter(data, var_names=None, combined=False, skip_dims=None, revers
 
     for var_name in var_names:
         if var_name in data:
-            new_dims = [dim for dim in data[var_name].dims if dim not in skip_dims]
-            vals = [set(data[var_name][dim].values) for dim in new_dims]
-            dims = [{k: v for k, v in zip(new_dims, prod)} for prod in product(*vals)]
+            new_dims, selections, values = _iter_dims_first(data[var_name], skip_dims)
+            indices = range(len(selections))
             if reverse_selections:
-                dims = reversed(dims)
+                indices = reversed(indices)
 
-            for selection in dims:
-                yield var_name, selection, data[var_name].sel(**selection).values
+            for idx in indices:
+                yield var_name, dict(zip(new_dims, selections[idx])), values[idx, ...]
 
 
 def xarray_to_ndarray(data, *, var_names=None, combined=True):
@@ -291,16 +337,55 @@ def xarray_to_ndarray(data, *, var_names=None, combined=True):
     data: np.array
         Data values
     """
-    unpacked_data, unpacked_var_names, = [], []
+    skip_dims = {"chain", "draw"} if combined else {"draw"}
+    if var_names is None:
+        var_names = list(data.data_vars)
+
+    unpacked_var_names, blocks = [], []
+    for var_name in var_names:
+        if var_name in data:
+            new_dims, selections, values = _iter_dims_first(data[var_name], skip_dims)
+            unpacked_var_names.extend(
+                make_label(var_name, dict(zip(new_dims, selection))) for selection in selections
+            )
+            blocks.append(values)
+
+    if len(blocks) == 1:
+        # a single variable is returned as a view whenever its samples are already last
+        return unpacked_var_names, blocks[0].reshape(len(unpacked_var_names), -1)
+
+    # merge chains and variables, writing every variable once into the output
+    n_samples = blocks[0][0].size if blocks else 0
+    unpacked_data = np.empty(
+        (len(unpacked_var_names), n_samples), dtype=np.result_type(*blocks) if blocks else float
+    )
+    start = 0
+    for values in blocks:
+        stop = start + len(values)
+        unpacked_data[start:stop].reshape(values.shape)[...] = values
+        start = stop
 
-    # Merge chains and variables
-    for var_name, selection, data_array in xarray_var_iter(
-        data, var_names=var_names, combined=combined
-    ):
-        unpacked_data.append(data_array.flatten())
-        unpacked_var_names.append(make_label(var_name, selection))
+    return unpacked_var_names, unpacked_data
 
-    return unpacked_var_names, np.array(unpacked_data)
+
+def _iter_dims_first(data_array, skip_dims):
+    """Transpose data_array so the dimensions not in skip_dims come first and flatten them.
+
+    Returns
+    -------
+    new_dims : list
+        Dimensions to iterate over, in their original order
+    selections : list of tuples
+        Coordinate values of every combination of new_dims, in C order
+    values : np.array
+        Values of data_array, one entry along the first axis per selection followed by the
+        skip_dims in their original order. It is a view whenever possible
+    """
+    new_dims = [dim for dim in data_array.dims if dim not in skip_dims]
+    flat_dims = [dim for dim in data_array.dims if dim in skip_dims]
+    values = data_array.transpose(*new_dims, *flat_dims).values
+    selections = list(product(*[data_array[dim].values for dim in new_dims]))
+    return new_dims, selections, values.reshape((len(selections),) + values.shape[len(new_dims) :])
 
 
 def get_coords(data, coords):
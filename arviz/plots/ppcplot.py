@@ -1,6 +1,7 @@
 """Posterior predictive plot."""
+from matplotlib.collections import LineCollection
 import numpy as np
-from .kdeplot import plot_kde, _fast_kde
+from .kdeplot import plot_kde, _fast_kde_batch
 from .plot_utils import (
     xarray_var_iter,
     _scale_fig_size,
@@ -24,6 +25,7 @@ def plot_ppc(
     flatten=None,
     num_pp_samples=None,
     random_seed=None,
+    bands=None,
 ):
     """
     Plot for Posterior Predictive checks.
@@ -74,6 +76,10 @@ def plot_ppc(
         reproducibility of the plot. By default, no seed will be provided
         and the plot will change each call if a random sample is specified
         by `num_pp_samples`.
+    bands : sequence of float, optional
+        Probabilities of central intervals, e.g. (0.5, 0.94), used to summarize the posterior
+        predictive densities or cumulative distributions with pointwise quantile bands instead
+        of drawing one curve per sample. Not available for `kind` = 'scatter'.
 
     Returns
     -------
@@ -120,6 +126,13 @@ def plot_ppc(
         :context: close-figs
 
         >>> az.plot_ppc(data, num_pp_samples=30, random_seed=7)
+
+    Summarize the posterior predictive densities with 50% and 94% quantile bands.
+
+    .. plot::
+        :context: close-figs
+
+        >>> az.plot_ppc(data, bands=(0.5, 0.94))
     """
     for group in ("posterior_predictive", "observed_data"):
         if not hasattr(data, group):
@@ -130,6 +143,13 @@ def plot_ppc(
     if kind.lower() not in ("density", "cumulative", "scatter"):
         raise TypeError("`kind` argument must be either `density`, `cumulative`, or `scatter`")
 
+    if bands is not None:
+        if kind == "scatter":
+            raise TypeError("`bands` argument is not available for `kind` = `scatter`")
+        bands = np.atleast_1d(bands)
+        if not np.all((bands > 0) & (bands < 1)):
+            raise ValueError("`bands` must be probabilities between 0 and 1")
+
     if data_pairs is None:
         data_pairs = {}
 
@@ -228,24 +248,18 @@ def plot_ppc(
                     zorder=3,
                     drawstyle="steps-pre",
                 )
-            # run plot_kde manually with one plot call
-            pp_densities = []
-            for vals in pp_sampled_vals:
-                vals = np.array([vals]).flatten()
-                if dtype == "f":
-                    pp_density, lower, upper = _fast_kde(vals)
-                    pp_x = np.linspace(lower, upper, len(pp_density))
-                    pp_densities.extend([pp_x, pp_density])
-                else:
-                    nbins = round(len(vals) ** 0.5)
-                    hist, bin_edges = np.histogram(vals, bins=nbins, density=True)
-                    hist = np.concatenate((hist[:1], hist))
-                    pp_densities.extend([bin_edges, hist])
-            plot_kwargs = {"color": "C5", "alpha": alpha, "linewidth": 0.5 * linewidth}
-            if dtype == "i":
-                plot_kwargs["drawstyle"] = "steps-pre"
-            ax.plot(*pp_densities, **plot_kwargs)
-            ax.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
+            pp_x, pp_density = _ppc_densities(pp_sampled_vals, dtype)
+            _plot_ppc_overlays(
+                pp_x,
+                pp_density,
+                bands,
+                step=dtype == "i",
+                label="Posterior predictive {}".format(pp_var_name),
+                color="C5",
+                alpha=alpha,
+                linewidth=0.5 * linewidth,
+                ax=ax,
+            )
             if mean:
                 if dtype == "f":
                     plot_kde(
@@ -295,23 +309,19 @@ def plot_ppc(
                     drawstyle="steps-pre",
                     zorder=3
                 )
-            # run plot_kde manually with one plot call
-            pp_densities = []
-            for vals in pp_sampled_vals:
-                vals = np.array([vals]).flatten()
-                pp_x, pp_density = _empirical_cdf(vals)
-                pp_densities.extend([pp_x, pp_density])
-            if dtype == "f":
-                ax.plot(*pp_densities, alpha=alpha, color="C5", linewidth=linewidth)
-            else:
-                ax.plot(
-                    *pp_densities,
-                    alpha=alpha,
-                    color="C5",
-                    drawstyle="steps-pre",
-                    linewidth=linewidth
-                )
-            ax.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
+            pp_x, pp_density = _ppc_ecdfs(pp_sampled_vals)
+            _plot_ppc_overlays(
+                pp_x,
+                pp_density,
+                bands,
+                step=dtype == "i",
+                label="Posterior predictive {}".format(pp_var_name),
+                color="C5",
+                alpha=alpha,
+                linewidth=linewidth,
+                cumulative=True,
+                ax=ax,
+            )
             if mean:
                 if dtype == "f":
                     ax.plot(
@@ -408,3 +418,144 @@ def _empirical_cdf(data):
         x and y coordinates for the empirical cdf of the data
     """
     return np.sort(data), np.linspace(0, 1, len(data))
+
+
+def _ppc_densities(pp_sampled_vals, dtype):
+    """Compute the densities of all posterior predictive samples at once.
+
+    Parameters
+    ----------
+    pp_sampled_vals : np.array
+        Posterior predictive samples, one per row
+    dtype : str
+        Kind of the observed data, continuous samples ("f") are smoothed with a kde and
+        discrete samples with a histogram
+
+    Returns
+    -------
+    np.array, np.array
+        x and y coordinates of the densities, one row per sample. Both are evaluated on
+        evenly spaced grids, histograms repeat their first value to be drawn as steps-pre
+    """
+    pp_sampled_vals = pp_sampled_vals.reshape(len(pp_sampled_vals), -1)
+    if dtype == "f":
+        pp_density, lower, upper = _fast_kde_batch(pp_sampled_vals)
+        pp_x = np.linspace(lower, upper, pp_density.shape[1], axis=1)
+        return pp_x, pp_density
+
+    n_samples, n_obs = pp_sampled_vals.shape
+    nbins = max(int(round(n_obs ** 0.5)), 1)
+    lower = pp_sampled_vals.min(axis=1).astype(float)
+    upper = pp_sampled_vals.max(axis=1).astype(float)
+    # same range as np.histogram for constant samples
+    constant = lower == upper
+    lower[constant] -= 0.5
+    upper[constant] += 0.5
+    width = (upper - lower) / nbins
+
+    bin_ix = ((pp_sampled_vals - lower[:, None]) / width[:, None]).astype(int)
+    bin_ix = np.minimum(bin_ix, nbins - 1) + nbins * np.arange(n_samples)[:, None]
+    counts = np.bincount(bin_ix.ravel(), minlength=n_samples * nbins).reshape(n_samples, nbins)
+    hist = counts / (n_obs * width[:, None])
+    pp_x = np.linspace(lower, upper, nbins + 1, axis=1)
+    return pp_x, np.concatenate((hist[:, :1], hist), axis=1)
+
+
+def _ppc_ecdfs(pp_sampled_vals):
+    """Compute the empirical cdfs of all posterior predictive samples at once.
+
+    Parameters
+    ----------
+    pp_sampled_vals : np.array
+        Posterior predictive samples, one per row
+
+    Returns
+    -------
+    np.array, np.array
+        x and y coordinates of the empirical cdfs, one row per sample
+    """
+    pp_x = np.sort(pp_sampled_vals.reshape(len(pp_sampled_vals), -1), axis=1)
+    pp_y = np.broadcast_to(np.linspace(0, 1, pp_x.shape[1]), pp_x.shape)
+    return pp_x, pp_y
+
+
+def _steps_pre(x, y):
+    """Expand rows of x and y coordinates into the vertices drawn by drawstyle steps-pre."""
+    steps_x = np.repeat(x, 2, axis=-1)[..., 1:]
+    steps_y = np.repeat(y, 2, axis=-1)[..., :-1]
+    return steps_x, steps_y
+
+
+def _density_on_grid(grid, pp_x, pp_density, step=False):
+    """Evaluate densities defined on evenly spaced rows of pp_x at common grid points.
+
+    Densities are linearly interpolated (or read as steps-pre if step is True) and are zero
+    outside the range of each row.
+    """
+    lower, upper = pp_x[:, :1], pp_x[:, -1:]
+    last = pp_x.shape[1] - 1
+    position = (grid - lower) / (upper - lower) * last
+    if step:
+        index = np.clip(np.ceil(position), 0, last).astype(int)
+        values = np.take_along_axis(pp_density, index, axis=1)
+    else:
+        index = np.clip(np.floor(position), 0, last - 1).astype(int)
+        frac = position - index
+        values = np.take_along_axis(pp_density, index, axis=1) * (1 - frac)
+        values += np.take_along_axis(pp_density, index + 1, axis=1) * frac
+    return np.where((position >= 0) & (position <= last), values, 0)
+
+
+def _plot_ppc_overlays(
+    pp_x, pp_density, bands, step, label, color, alpha, linewidth, ax, cumulative=False
+):
+    """Draw posterior predictive curves as a single LineCollection or as quantile bands.
+
+    Parameters
+    ----------
+    pp_x, pp_density : np.array
+        x and y coordinates of the curves, one row per posterior predictive sample
+    bands : sequence of float or None
+        Probabilities of the central intervals to draw instead of the individual curves
+    step : bool
+        Draw the curves with drawstyle steps-pre
+    cumulative : bool
+        Whether the curves are empirical cdfs sharing their y coordinates
+    """
+    if bands is None:
+        if step:
+            pp_x, pp_density = _steps_pre(pp_x, pp_density)
+        lines = LineCollection(
+            np.stack((pp_x, pp_density), axis=-1),
+            colors=color,
+            alpha=alpha,
+            linewidths=linewidth,
+        )
+        ax.add_collection(lines)
+        ax.autoscale_view()
+        ax.plot([], color=color, label=label)
+        return
+
+    for band in sorted(bands, reverse=True):
+        quantiles = [(1 - band) / 2, (1 + band) / 2]
+        band_label = "{} {:g}% interval".format(label, 100 * band)
+        if cumulative:
+            # all empirical cdfs share their y values, so quantiles of the sorted samples
+            # give the band in the x direction
+            lower, upper = np.quantile(pp_x, quantiles, axis=0)
+            ax.fill_betweenx(
+                pp_density[0], lower, upper, color=color, alpha=alpha, linewidth=0, label=band_label
+            )
+        else:
+            grid = np.linspace(pp_x.min(), pp_x.max(), max(pp_x.shape[1], 200))
+            lower, upper = np.quantile(_density_on_grid(grid, pp_x, pp_density, step), quantiles, 0)
+            ax.fill_between(
+                grid,
+                lower,
+                upper,
+                step="pre" if step else None,
+                color=color,
+                alpha=alpha,
+                linewidth=0,
+                label=band_label,
+            )
@@ -20,6 +20,7 @@ def plot_trace(
     kde_kwargs=None,
     hist_kwargs=None,
     trace_kwargs=None,
+    downsample=None,
 ):
     """Plot samples histograms and values.
 
@@ -54,6 +55,11 @@ def plot_trace(
         Extra keyword arguments passed to `plt.hist`. Only affects discrete variables.
     trace_kwargs : dict
         Extra keyword arguments passed to `plt.plot`
+    downsample : int or "auto", optional
+        Draw every trace from the minimum and maximum of `downsample` blocks of consecutive draws
+        instead of from every draw, which keeps the extremes visible while the rendering time no
+        longer depends on the number of draws. With "auto" one block per pixel column of the
+        trace axes is used. Defaults to plotting every draw.
     Returns
     -------
     axes : matplotlib axes
@@ -88,6 +94,13 @@ def plot_trace(
         >>> lines = (('theta_t',{'theta_t_dim_0':0}, [-1]),)
         >>> coords = {'theta_t_dim_0': [0, 1], 'school':['Lawrenceville']}
         >>> az.plot_trace(data, var_names=('theta_t', 'theta'), coords=coords, lines=lines)
+
+    Render long traces from the extremes of each pixel column
+
+    .. plot::
+        :context: close-figs
+
+        >>> az.plot_trace(data, var_names=('theta_t', 'theta'), coords=coords, downsample='auto')
     """
     if divergences:
         try:
@@ -139,8 +152,18 @@ def plot_trace(
             value = value.flatten()
         value = np.atleast_2d(value)
 
-        for row in value:
-            axes[idx, 1].plot(np.arange(len(row)), row, **trace_kwargs)
+        if downsample is None:
+            trace_x = np.broadcast_to(np.arange(value.shape[1]), value.shape)
+            trace_y = value
+        else:
+            if downsample == "auto":
+                n_blocks = int(axes[idx, 1].get_window_extent().width)
+            else:
+                n_blocks = downsample
+            trace_x, trace_y = _decimate_minmax(value, n_blocks)
+
+        for row, row_x, row_y in zip(value, trace_x, trace_y):
+            axes[idx, 1].plot(row_x, row_y, **trace_kwargs)
 
             colors[idx].append(axes[idx, 1].get_lines()[-1].get_color())
             kde_kwargs["plot_kwargs"]["color"] = colors[idx][-1]
@@ -225,3 +248,36 @@ def _histplot_op(ax, data, **kwargs):
     xticks = get_bins(data, max_bins=10, fenceposts=1)
     ax.set_xticks(xticks)
     return ax
+
+
+def _decimate_minmax(values, n_blocks):
+    """Reduce every row of values to the minimum and maximum of n_blocks consecutive blocks.
+
+    Parameters
+    ----------
+    values : np.array
+        2d array, one trace per row
+    n_blocks : int
+        Number of blocks of consecutive draws each trace is split into
+
+    Returns
+    -------
+    np.array, np.array
+        Positions and values of the extremes of each block, in the order they were drawn. Rows
+        with at most 2 * n_blocks draws are returned as is.
+    """
+    n_chains, n_draws = values.shape
+    n_blocks = max(int(n_blocks), 1)
+    if n_draws <= 2 * n_blocks:
+        return np.broadcast_to(np.arange(n_draws), values.shape), values
+
+    block_size = -(-n_draws // n_blocks)
+    n_blocks = -(-n_draws // block_size)
+    # repeating the last draw does not change the extremes of the last block
+    padded = np.pad(values, ((0, 0), (0, n_blocks * block_size - n_draws)), mode="edge")
+    blocks = padded.reshape(n_chains, n_blocks, block_size)
+    extremes = np.stack((blocks.argmin(axis=2), blocks.argmax(axis=2)), axis=2)
+    extremes.sort(axis=2)
+    trace_x = (extremes + block_size * np.arange(n_blocks)[:, None]).reshape(n_chains, -1)
+    trace_x = np.minimum(trace_x, n_draws - 1)
+    return trace_x, np.take_along_axis(values, trace_x, axis=1)
@@ -4,7 +4,7 @@ import numpy as np
 
 from ..data import convert_to_dataset
 from ..stats import hpd
-from .kdeplot import _fast_kde
+from .kdeplot import _fast_kde_rows
 from .plot_utils import get_bins, _scale_fig_size, xarray_var_iter, make_label
 from ..utils import _var_names
 
@@ -83,12 +83,15 @@ def plot_violin(
 
     ax = np.atleast_1d(ax)
 
+    continuous = [idx for idx, (_, _, x) in enumerate(plotters) if x.dtype.kind != "i"]
+    kdes = dict(zip(continuous, _fast_kde_rows([plotters[idx][2] for idx in continuous], bw=bw)))
+
     for axind, (var_name, selection, x) in enumerate(plotters):
         val = x.flatten()
-        if val[0].dtype.kind == "i":
-            cat_hist(val, shade, ax[axind], **kwargs_shade)
+        if axind in kdes:
+            _violinplot(kdes[axind], shade, ax[axind], **kwargs_shade)
         else:
-            _violinplot(val, shade, bw, ax[axind], **kwargs_shade)
+            cat_hist(val, shade, ax[axind], **kwargs_shade)
 
         per = np.percentile(val, [25, 75, 50])
         hpd_intervals = hpd(val, credible_interval)
@@ -111,9 +114,9 @@ def plot_violin(
     return ax
 
 
-def _violinplot(val, shade, bw, ax, **kwargs_shade):
-    """Auxiliary function to plot violinplots."""
-    density, low_b, up_b = _fast_kde(val, bw=bw)
+def _violinplot(kde, shade, ax, **kwargs_shade):
+    """Auxiliary function to plot violinplots from a KDE, as returned by `_fast_kde`."""
+    density, low_b, up_b = kde
     x = np.linspace(low_b, up_b, len(density))
 
     x = np.concatenate([x, x[::-1]])
@@ -64,10 +64,7 @@ def _neff_ufunc(ary):
     This can be used on an xarray Dataset, using
     `xr.apply_ufunc(_neff_ufunc, ..., input_core_dims=(('chain', 'draw'),))
     """
-    target = np.empty(ary.shape[:-2])
-    for idx in np.ndindex(target.shape):
-        target[idx] = _get_neff(ary[idx])
-    return target
+    return _get_neff_batch(ary)
 
 
 def _get_neff(sample_array):
@@ -75,45 +72,41 @@ def _get_neff(sample_array):
     shape = sample_array.shape
     if len(shape) != 2:
         raise TypeError("Effective sample size calculation requires 2 dimensional arrays.")
-    n_chain, n_draws = shape
+    ess = _get_neff_batch(sample_array)
+    return int(ess) if np.isfinite(ess) else np.nan
+
+
+def _get_neff_batch(sample_array):
+    """Compute the effective sample size over the last two (chain, draw) axes of an array.
+
+    All the leading axes are computed at once, the autocovariances of every chain with a single
+    fft and Geyer's initial positive and monotone sequences as cumulative operations over pairs
+    of lags. The result is truncated to whole samples. Where it is undefined, as for constant
+    chains, it is NaN.
+    """
+    n_chain, n_draws = sample_array.shape[-2:]
     if n_chain <= 1:
         raise TypeError("Effective sample size calculation requires multiple chains.")
 
-    acov = np.asarray([_autocov(sample_array[chain]) for chain in range(n_chain)])
-
-    chain_mean = sample_array.mean(axis=1)
-    chain_var = acov[:, 0] * n_draws / (n_draws - 1.0)
-    acov_t = acov[:, 1] * n_draws / (n_draws - 1.0)
-    mean_var = np.mean(chain_var)
+    acov = _autocov_batch(sample_array)
+    chain_mean = sample_array.mean(axis=-1)
+    mean_var = np.mean(acov[..., 0], axis=-1) * n_draws / (n_draws - 1.0)
     var_plus = mean_var * (n_draws - 1.0) / n_draws
-    var_plus += np.var(chain_mean, ddof=1)
-
-    rho_hat_t = np.zeros(n_draws)
-    rho_hat_even = 1.0
-    rho_hat_t[0] = rho_hat_even
-    rho_hat_odd = 1.0 - (mean_var - np.mean(acov_t)) / var_plus
-    rho_hat_t[1] = rho_hat_odd
-    # Geyer's initial positive sequence
-    max_t = 1
-    t = 1
-    while t < (n_draws - 2) and (rho_hat_even + rho_hat_odd) >= 0.0:
-        rho_hat_even = 1.0 - (mean_var - np.mean(acov[:, t + 1])) / var_plus
-        rho_hat_odd = 1.0 - (mean_var - np.mean(acov[:, t + 2])) / var_plus
-        if (rho_hat_even + rho_hat_odd) >= 0:
-            rho_hat_t[t + 1] = rho_hat_even
-            rho_hat_t[t + 2] = rho_hat_odd
-        max_t = t + 2
-        t += 2
-
-    # Geyer's initial monotone sequence
-    t = 3
-    while t <= max_t - 2:
-        if (rho_hat_t[t + 1] + rho_hat_t[t + 2]) > (rho_hat_t[t - 1] + rho_hat_t[t]):
-            rho_hat_t[t + 1] = (rho_hat_t[t - 1] + rho_hat_t[t]) / 2.0
-            rho_hat_t[t + 2] = rho_hat_t[t + 1]
-        t += 2
-    ess = int((n_chain * n_draws) / (-1.0 + 2.0 * np.sum(rho_hat_t)))
-    return ess
+    var_plus += np.var(chain_mean, axis=-1, ddof=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho_hat = 1.0 - (mean_var[..., None] - np.mean(acov, axis=-2)) / var_plus[..., None]
+        acov_t = np.mean(acov[..., 1], axis=-1) * n_draws / (n_draws - 1.0)
+        rho_hat_odd = 1.0 - (mean_var - acov_t) / var_plus
+        # Geyer's initial positive sequence over the pairs of lags (2t, 2t + 1), t >= 1
+        n_pairs = (n_draws - 2) // 2
+        pairs = rho_hat[..., 2 : 2 * n_pairs + 2 : 2] + rho_hat[..., 3 : 2 * n_pairs + 3 : 2]
+        positive = np.cumprod(pairs >= 0, axis=-1) * (1.0 + rho_hat_odd >= 0)[..., None]
+        # Geyer's initial monotone sequence
+        pairs = np.minimum.accumulate(np.where(positive, pairs, 0), axis=-1)
+        rho_hat_sum = 1.0 + rho_hat_odd + pairs.sum(axis=-1)
+        ess = (n_chain * n_draws) / (-1.0 + 2.0 * rho_hat_sum)
+    return np.where(np.isfinite(ess), np.trunc(ess), np.nan)
 
 
 def autocorr(x):
@@ -157,6 +150,16 @@ def _autocov(x):
     return acov
 
 
+def _autocov_batch(x):
+    """Compute autocovariance estimates for every lag along the last axis of an array."""
+    len_x = x.shape[-1]
+    y = x - x.mean(axis=-1, keepdims=True)
+    n_fft = 2 ** int(np.ceil(np.log2(2 * len_x - 1)))
+    y_ft = np.fft.rfft(y, n=n_fft, axis=-1)
+    acov = np.fft.irfft(y_ft * np.conjugate(y_ft), n=n_fft, axis=-1)[..., :len_x]
+    return acov / np.arange(len_x, 0, -1)
+
+
 def gelman_rubin(data, var_names=None):
     r"""Compute estimate of R-hat for a set of traces.
 
@@ -212,10 +215,7 @@ def _rhat_ufunc(ary):
     This can be used on an xarray Dataset, using
     `xr.apply_ufunc(_neff_ufunc, ..., input_core_dims=(('chain', 'draw'),))
     """
-    target = np.empty(ary.shape[:-2])
-    for idx in np.ndindex(target.shape):
-        target[idx] = _get_rhat(ary[idx])
-    return target
+    return _get_rhat_batch(ary)
 
 
 def _get_rhat(values, round_to=2):
@@ -223,19 +223,24 @@ def _get_rhat(values, round_to=2):
     shape = values.shape
     if len(shape) != 2:
         raise TypeError("Effective sample size calculation requires 2 dimensional arrays.")
-    _, num_samples = shape
+    return float(_get_rhat_batch(values, round_to=round_to))
+
+
+def _get_rhat_batch(values, round_to=2):
+    """Compute the rhat over the last two (chain, draw) axes of an array."""
+    num_samples = values.shape[-1]
 
     # Calculate between-chain variance
-    between_chain_variance = num_samples * np.var(np.mean(values, axis=1), axis=0, ddof=1)
+    between_chain_variance = num_samples * np.var(np.mean(values, axis=-1), axis=-1, ddof=1)
     # Calculate within-chain variance
-    within_chain_variance = np.mean(np.var(values, axis=1, ddof=1), axis=0)
+    within_chain_variance = np.mean(np.var(values, axis=-1, ddof=1), axis=-1)
     # Estimate of marginal posterior variance
     v_hat = (
         within_chain_variance * (num_samples - 1) / num_samples
         + between_chain_variance / num_samples
     )
 
-    return round((v_hat / within_chain_variance) ** 0.5, round_to)
+    return np.round((v_hat / within_chain_variance) ** 0.5, round_to)
 
 
 def geweke(values, first=0.1, last=0.5, intervals=20):
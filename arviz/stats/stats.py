@@ -14,6 +14,9 @@ from ..utils import _var_names
 
 __all__ = ["bfmi", "compare", "hpd", "loo", "psislw", "r2_score", "summary", "waic"]
 
+# fewest draws per chain that `summary` keeps when subsampling with `max_draws`
+_MIN_SUBSAMPLE_DRAWS = 20
+
 
 def bfmi(energy):
     r"""Calculate the estimated Bayesian fraction of missing information (BFMI).
@@ -243,6 +246,9 @@ def hpd(x, credible_interval=0.94, circular=False):
     np.ndarray
         lower and upper value of the interval.
     """
+    if x.ndim == 2 and not circular:
+        # all the columns at once
+        return _hpd_columns(x, credible_interval)
     if x.ndim > 1:
         hpd_array = np.array(
             [hpd(row, credible_interval=credible_interval, circular=circular) for row in x.T]
@@ -281,6 +287,25 @@ def hpd(x, credible_interval=0.94, circular=False):
     return np.array([hdi_min, hdi_max])
 
 
+def _hpd_columns(x, credible_interval):
+    """Compute the hpd of every column of a 2d array with vectorized operations."""
+    len_x = len(x)
+    x = np.sort(x.T, axis=1)
+    interval_idx_inc = int(np.floor(credible_interval * len_x))
+    n_intervals = len_x - interval_idx_inc
+    interval_width = x[:, interval_idx_inc:] - x[:, :n_intervals]
+
+    if interval_width.shape[1] == 0:
+        raise ValueError(
+            "Too few elements for interval calculation. "
+            "Check that credible_interval meets condition 0 =< credible_interval < 1"
+        )
+
+    min_idx = np.argmin(interval_width, axis=1)
+    rows = np.arange(len(x))
+    return np.stack((x[rows, min_idx], x[rows, min_idx + interval_idx_inc]), axis=1)
+
+
 def loo(data, pointwise=False, reff=None):
     """Pareto-smoothed importance sampling leave-one-out cross-validation.
 
@@ -313,9 +338,9 @@ def loo(data, pointwise=False, reff=None):
             raise TypeError(
                 "Must be able to extract a {group}" "group from data!".format(group=group)
             )
+    posterior = inference_data.posterior
     if "log_likelihood" not in inference_data.sample_stats:
         raise TypeError("Data must include log_likelihood in sample_stats")
-    posterior = inference_data.posterior
     log_likelihood = inference_data.sample_stats.log_likelihood
     n_samples = log_likelihood.chain.size * log_likelihood.draw.size
     new_shape = (n_samples,) + log_likelihood.shape[2:]
@@ -553,6 +578,8 @@ def summary(
     stat_funcs=None,
     extend=True,
     credible_interval=0.94,
+    max_draws=None,
+    seed=None,
 ):
     """Create a data frame with summary statistics.
 
@@ -582,13 +609,24 @@ def summary(
     credible_interval : float, optional
         Credible interval to plot. Defaults to 0.94. This is only meaningful when `stat_funcs` is
         None.
+    max_draws : int, optional
+        Approximate the summary from at most `max_draws` draws in total, for fast exploration of
+        very long traces. The same number of draws is taken from every chain, one at random from
+        each of equally long consecutive blocks of draws, and at least 20 draws per chain are
+        required. An `approx error` column then reports the standard error of the subsampled
+        mean with respect to the mean of all draws. Defaults to None, which always uses all
+        draws.
+    seed : int or np.random.RandomState instance
+        If int or RandomState, use it for seeding the subsample. Only useful when `max_draws` is
+        used. Default None the global np.random state is used.
 
     Returns
     -------
     pandas.DataFrame
         With summary statistics for each variable. Defaults statistics are: `mean`, `sd`,
         `hpd_3%`, `hpd_97%`, `mc_error`, `eff_n` and `r_hat`. `eff_n` and `r_hat` are only computed
-        for traces with 2 or more chains.
+        for traces with 2 or more chains. When `max_draws` is used, `eff_n` and `r_hat` are still
+        computed from all draws, and the other statistics from the subsample.
 
     Examples
     --------
@@ -623,6 +661,13 @@ def summary(
     if not isinstance(fmt, str) or (fmt.lower() not in fmt_group):
         raise TypeError("Invalid format: '{}'! Formatting options are: {}".format(fmt, fmt_group))
 
+    n_samples = posterior.dims["chain"] * posterior.dims["draw"]
+    subsampled = max_draws is not None and n_samples > max_draws
+    # convergence diagnostics are meaningless on thinned chains, so they always use all draws
+    full_posterior = posterior
+    if subsampled:
+        posterior = _subsample_draws(posterior, max_draws, seed=seed)
+
     alpha = 1 - credible_interval
 
     metrics = []
@@ -649,6 +694,13 @@ def summary(
         )
         metric_names.append("mc error")
 
+        if subsampled:
+            n_subsamples = posterior.dims["chain"] * posterior.dims["draw"]
+            # standard error of a subsample mean, with finite population correction
+            correction = np.sqrt(1 / n_subsamples - 1 / n_samples)
+            metrics.append(posterior.std(dim=("chain", "draw")) * correction)
+            metric_names.append("approx error")
+
         metrics.append(
             xr.apply_ufunc(
                 _make_ufunc(hpd, index=0, credible_interval=credible_interval),
@@ -714,10 +766,10 @@ def summary(
         metric_names.append("circular hpd {:.2%}".format(1 - alpha / 2))
 
     if len(posterior.chain) > 1:
-        metrics.append(effective_n(posterior, var_names=var_names))
+        metrics.append(effective_n(full_posterior, var_names=var_names))
         metric_names.append("eff_n")
 
-        metrics.append(gelman_rubin(posterior, var_names=var_names))
+        metrics.append(gelman_rubin(full_posterior, var_names=var_names))
         metric_names.append("r_hat")
 
     joined = xr.concat(metrics, dim="metric").assign_coords(metric=metric_names)
@@ -748,6 +800,31 @@ def summary(
     return summary_df.round(round_to)
 
 
+def _subsample_draws(dataset, max_draws, seed=None):
+    """Take a stratified subsample of at most `max_draws` draws, evenly across chains.
+
+    The draws of each chain are split into consecutive blocks of (nearly) equal length and one
+    draw is picked at random from every block.
+    """
+    n_chains, n_draws = dataset.dims["chain"], dataset.dims["draw"]
+    n_blocks = min(max_draws // n_chains, n_draws)
+    if n_blocks < _MIN_SUBSAMPLE_DRAWS:
+        raise ValueError(
+            "max_draws must be at least {} for {} chains, got {}".format(
+                _MIN_SUBSAMPLE_DRAWS * n_chains, n_chains, max_draws
+            )
+        )
+    if seed is None:
+        random_sample = np.random.random_sample
+    else:
+        if not isinstance(seed, np.random.RandomState):
+            seed = np.random.RandomState(seed)
+        random_sample = seed.random_sample
+    edges = np.linspace(0, n_draws, n_blocks + 1).astype(int)
+    draws = edges[:-1] + (random_sample(n_blocks) * np.diff(edges)).astype(int)
+    return dataset.isel(draw=draws)
+
+
 def _make_ufunc(func, index=Ellipsis, **kwargs):  # noqa: D202
     """Make ufunc from function."""
 
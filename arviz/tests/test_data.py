@@ -2,11 +2,14 @@
 import os
 from urllib.parse import urlunsplit
 
+import emcee
 import numpy as np
 import pymc3 as pm
 import pytest
 
 from arviz import (
+    InferenceData,
+    batch_convert_to_inference_data,
     convert_to_inference_data,
     convert_to_dataset,
     from_cmdstan,
@@ -16,8 +19,13 @@ from arviz import (
     load_arviz_data,
     list_datasets,
     clear_data_home,
+    concat,
+    waic,
 )
+from ..data.base import dict_to_dataset, make_attrs
 from ..data.datasets import REMOTE_DATASETS, LOCAL_DATASETS, RemoteFileMetadata
+from ..data.io_cmdstan import _parse_rdump_values
+from ..data.io_pystan import get_draws, infer_metadata
 from .helpers import (  # pylint: disable=unused-import
     eight_schools_params,
     load_cached_models,
@@ -205,6 +213,137 @@ def test_dict_to_dataset():
     assert set(dataset.b.coords) == {"chain", "draw", "c"}
 
 
+@pytest.mark.parametrize("unused", [3, np.zeros((2, 3))])
+def test_dict_to_dataset_unused_coords(unused):
+    dataset = dict_to_dataset({"x": np.random.randn(2, 10)}, coords={"unused": unused})
+    assert set(dataset.coords) == {"chain", "draw"}
+
+
+def test_dict_to_dataset_shares_memory():
+    datadict = {"a": np.random.randn(2, 100), "b": np.random.randn(2, 100, 10)}
+    dataset = convert_to_dataset(datadict, coords={"c": np.arange(10)}, dims={"b": ["c"]})
+    assert np.shares_memory(dataset.a.values, datadict["a"])
+    assert np.shares_memory(dataset.b.values, datadict["b"])
+
+
+def test_make_attrs_library_version():
+    attrs = make_attrs(library=np)
+    assert attrs["inference_library"] == "numpy"
+    assert attrs["inference_library_version"] == np.__version__
+    assert make_attrs(library=np)["inference_library_version"] == np.__version__
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_batch_convert_to_inference_data(n_jobs):
+    objs = [{"a": np.random.randn(2, 50), "b": np.random.randn(2, 50, 3)} for _ in range(4)]
+    inference_data = batch_convert_to_inference_data(objs, dims={"b": ["c"]}, n_jobs=n_jobs)
+    assert len(inference_data) == 4
+    for item, obj in zip(inference_data, objs):
+        assert np.all(item.posterior.b.values == obj["b"])
+
+    folds = ["w", "x", "y", "z"]
+    stacked = batch_convert_to_inference_data(
+        objs, dim="fold", coords={"fold": folds}, dims={"b": ["c"]}, n_jobs=n_jobs
+    )
+    assert stacked.posterior.b.dims == ("fold", "chain", "draw", "c")
+    assert list(stacked.posterior.fold.values) == folds
+    assert np.all(stacked.posterior.a.sel(fold="y").values == objs[2]["a"])
+
+
+def _emcee_normal_lnprob(theta):
+    """Defined at module level, so that the sampler can be pickled."""
+    return -0.5 * np.sum(theta ** 2)
+
+
+def _emcee_sampler(lnprob):
+    sampler = emcee.EnsembleSampler(6, 2, lnprob)
+    sampler.run_mcmc(np.random.randn(6, 2), 50)
+    return sampler
+
+
+def test_batch_convert_to_inference_data_fits():
+    """Fits that can not be pickled are converted in the calling process."""
+    objs = [
+        _emcee_sampler(_emcee_normal_lnprob),
+        _emcee_sampler(lambda theta: -0.5 * np.sum(theta ** 2)),
+        _emcee_sampler(_emcee_normal_lnprob),
+        {"var_0": np.random.randn(6, 50)},
+    ]
+    serial = batch_convert_to_inference_data(objs, n_jobs=1)
+    parallel = batch_convert_to_inference_data(objs, n_jobs=2)
+    assert len(parallel) == len(objs)
+    for item, expected in zip(parallel, serial):
+        assert np.all(item.posterior.var_0.values == expected.posterior.var_0.values)
+
+
+def test_batch_convert_to_inference_data_paths(tmpdir):
+    objs = [{"a": np.random.randn(2, 50)} for _ in range(4)]
+    for idx in (1, 3):
+        path = os.path.join(str(tmpdir), "fold_{}.nc".format(idx))
+        convert_to_inference_data(objs[idx]).to_netcdf(path)
+        objs[idx] = path
+    inference_data = batch_convert_to_inference_data(objs, n_jobs=2)
+    assert len(inference_data) == 4
+    for item, obj in zip(inference_data, objs):
+        expected = convert_to_inference_data(obj).posterior.a.values
+        assert np.all(item.posterior.a.values == expected)
+
+
+@pytest.mark.parametrize("dim", ["chain", "draw"])
+def test_concat(dim):
+    first = load_arviz_data("centered_eight")
+    second = load_arviz_data("centered_eight")
+    combined = concat(first, second, dim=dim)
+    for group in ("posterior", "sample_stats", "posterior_predictive", "prior"):
+        dataset = getattr(combined, group)
+        assert dataset.dims[dim] == 2 * getattr(first, group).dims[dim]
+        assert np.all(dataset[dim].values == np.arange(dataset.dims[dim]))
+    assert combined.observed_data.equals(first.observed_data)
+    assert np.all(
+        combined.posterior.theta.isel(**{dim: slice(None, first.posterior.dims[dim])})
+        == first.posterior.theta
+    )
+
+
+def test_concat_new_dim():
+    first = load_arviz_data("centered_eight")
+    combined = concat(first, first, first, dim="run")
+    assert combined.posterior.theta.dims == ("run", "chain", "draw", "school")
+    assert combined.observed_data.obs.dims == ("run", "school")
+    assert list(combined.posterior.run.values) == [0, 1, 2]
+
+
+def test_concat_mismatched_coords():
+    first = load_arviz_data("centered_eight")
+    second = load_arviz_data("centered_eight")
+    second.posterior = second.posterior.assign_coords(school=np.arange(8))
+    with pytest.raises(ValueError):
+        concat(first, second)
+
+
+def test_inference_data_isel():
+    posterior = convert_to_dataset({"a": np.random.randn(2, 100), "b": np.random.randn(2, 100, 3)})
+    observed_data = convert_to_dataset({"y": np.random.randn(1, 1, 5)}).squeeze(["chain", "draw"])
+    inference_data = InferenceData(posterior=posterior, observed_data=observed_data)
+    subset = inference_data.isel(draw=slice(50, None, 2), var_names=["b"])
+    assert subset.posterior.dims["draw"] == 25
+    assert list(subset.posterior.data_vars) == ["b"]
+    assert subset.observed_data.equals(observed_data)
+    assert np.shares_memory(subset.posterior.b.values, posterior.b.values)
+    with pytest.raises(ValueError):
+        inference_data.isel(school=0)
+
+
+def test_inference_data_sel():
+    inference_data = load_arviz_data("centered_eight")
+    subset = inference_data.sel(draw=slice(100, None), school="Choate")
+    assert subset.posterior.dims["draw"] == 400
+    assert subset.prior.dims["draw"] == inference_data.prior.dims["draw"] - 100
+    assert "school" not in subset.posterior.theta.dims
+    assert "school" not in subset.observed_data.obs.dims
+    assert np.all(subset.posterior.mu.values == inference_data.posterior.mu.values[:, 100:])
+
+
 def test_convert_to_dataset_idempotent():
     first = convert_to_dataset(np.random.randn(100))
     second = convert_to_dataset(first)
@@ -225,6 +364,15 @@ def test_convert_to_inference_data_from_file(tmpdir):
     assert first.foo.equals(second.foo)
 
 
+def test_convert_to_inference_data_from_npy_dir(tmpdir):
+    first = convert_to_inference_data(np.random.randn(4, 100, 3), group="foo")
+    dirname = str(tmpdir.join("test_dir"))
+    first.to_npy(dirname)
+    second = convert_to_inference_data(dirname)
+    assert first.foo.equals(second.foo)
+    assert isinstance(second.foo.x.values.base, np.memmap)
+
+
 def test_convert_to_inference_data_bad():
     with pytest.raises(ValueError):
         convert_to_inference_data(1)
@@ -335,6 +483,35 @@ class TestPyMC3NetCDFUtils:
         inference_data = self.get_inference_data(data, eight_schools_params)
         assert hasattr(inference_data, "prior")
 
+    def test_no_log_likelihood(self, data):
+        inference_data = from_pymc3(trace=data.obj, log_likelihood=False)
+        assert "log_likelihood" not in inference_data.sample_stats
+        with pytest.raises(TypeError):
+            waic(inference_data)
+
+    def test_log_likelihood_multiple_observed(self):
+        y = np.ma.masked_array([1.0, 2.0, 0.0, -1.0], mask=[0, 0, 1, 0])
+        with pm.Model() as model:
+            mu = pm.Normal("mu", 0, 1)
+            sd = pm.HalfNormal("sd", 1, shape=2)
+            pm.Normal("y", mu, 1, observed=y)
+            pm.Normal("z", mu, sd[:, None], observed=np.zeros((2, 3)))
+            trace = pm.sample(20, tune=20, chains=2, cores=1, progressbar=False)
+        inference_data = from_pymc3(trace=trace, dims={"y": ["y_dim"]})
+        log_likelihood = inference_data.sample_stats.log_likelihood
+        # all the observed variables are concatenated, so dims of a single one do not apply
+        assert log_likelihood.dims == ("chain", "draw", "log_likelihood_dim_0")
+        assert log_likelihood.shape == (2, 20, 3 + 6)
+        for chain in trace.chains:
+            for draw, point in enumerate(trace.points([chain])):
+                expected = np.concatenate(
+                    [
+                        model.y.logp_elemwise(point)[~y.mask],
+                        model.z.logp_elemwise(point).ravel(),
+                    ]
+                )
+                assert np.allclose(log_likelihood[chain, draw], expected)
+
 
 class TestPyStanNetCDFUtils:
     @pytest.fixture(scope="class")
@@ -440,6 +617,13 @@ class TestPyStanNetCDFUtils:
         assert hasattr(inference_data4.posterior, "theta")
         assert hasattr(inference_data4.prior, "theta")
 
+    def test_get_draws(self, data):
+        extract = pystan_extract_unpermuted(data.obj)
+        metadata = infer_metadata(data.obj)
+        for draws in (get_draws(data.obj), get_draws(data.obj, metadata=metadata)):
+            for key, values in extract.items():
+                assert np.all(draws[key] == np.swapaxes(values, 0, 1))
+
 
 class TestTfpNetCDFUtils:
     @pytest.fixture(scope="class")
@@ -715,6 +899,14 @@ class TestCmdStanNetCDFUtils:
             assert hasattr(inference_data.sample_stats, "log_likelihood")
             assert hasattr(inference_data, "observed_data")
 
+    def test_inference_data_n_jobs(self, paths):
+        """Check that reading files in parallel gives the same result"""
+        path = paths["eight_schools"]
+        inference_data = self.get_inference_data(posterior=path)
+        inference_data_parallel = self.get_inference_data(posterior=path, n_jobs=2)
+        assert inference_data.posterior.equals(inference_data_parallel.posterior)
+        assert inference_data.sample_stats.equals(inference_data_parallel.sample_stats)
+
     def test_inference_data_bad_csv(self, paths):
         """Check ValueError for csv with missing headers"""
         for key, _paths in paths.items():
@@ -776,3 +968,33 @@ class TestCmdStanNetCDFUtils:
         assert len(inference_data.observed_data.data_vars) == 2
         assert inference_data.observed_data["y"].shape == (3,)
         assert inference_data.observed_data["Z"].shape == (4, 5)
+
+    def test_inference_data_observed_data_dtypes(self, observed_data_paths):
+        """Read Rdump, check integer data is not converted to float"""
+        path = observed_data_paths[0]
+        inference_data = self.get_inference_data(posterior=None, observed_data=path)
+        assert inference_data.observed_data["y"].dtype.kind == "i"
+        path = observed_data_paths[1]
+        inference_data = self.get_inference_data(posterior=None, observed_data=path)
+        assert inference_data.observed_data["x"].dtype.kind == "i"
+        assert inference_data.observed_data["y"].dtype.kind == "f"
+        assert inference_data.observed_data["Z"].dtype.kind == "f"
+
+    @pytest.mark.parametrize(
+        "string,expected",
+        [
+            ("c(1L, -2L, 3L)", [1, -2, 3]),
+            ("2L:4L", [2, 3, 4]),
+            ("c(1.5, NA, Inf)", [1.5, np.nan, np.inf]),
+            ("c(1, NA)", [1.0, np.nan]),
+        ],
+    )
+    def test_parse_rdump_values(self, string, expected):
+        values = _parse_rdump_values(string)
+        assert values.dtype.kind == np.asarray(expected).dtype.kind
+        assert np.array_equal(values, expected, equal_nan=values.dtype.kind == "f")
+
+    @pytest.mark.parametrize("string", ["c(1, 2L3)", "c(1, L)", "c(1,,2)"])
+    def test_parse_rdump_values_invalid(self, string):
+        with pytest.raises(ValueError):
+            _parse_rdump_values(string)
@@ -5,6 +5,7 @@ import pytest
 
 from ..data import load_arviz_data
 from ..stats import gelman_rubin, effective_n, geweke
+from ..stats.diagnostics import _get_neff_batch, _get_rhat_batch
 
 GOOD_RHAT = 1.1
 
@@ -43,6 +44,28 @@ class TestDiagnostics:
         eff_n = effective_n(data, var_names=var_names)
         assert eff_n.mu > 100  # This might break if the data is regenerated
 
+    def test_diagnostics_batch(self):
+        """Confirm that batched effective_n and rhat match the 2d computations."""
+        values = np.random.randn(6, 4, 100).cumsum(axis=-1)
+        values[0] += np.arange(4)[:, None]
+        eff_n = _get_neff_batch(values)
+        r_hat = _get_rhat_batch(values)
+        assert eff_n.shape == r_hat.shape == (6,)
+        for row, row_eff_n, row_r_hat in zip(values, eff_n, r_hat):
+            assert effective_n(row) == row_eff_n
+            assert gelman_rubin(row) == row_r_hat
+
+    def test_effective_n_constant_chains(self):
+        values = np.random.randn(3, 4, 100)
+        values[1] = 1.0
+        eff_n = _get_neff_batch(values)
+        assert eff_n.dtype.kind == "f"
+        assert np.isnan(eff_n[1])
+        assert np.isfinite(eff_n[[0, 2]]).all()
+        assert np.isnan(effective_n(values[1]))
+        dataset = effective_n({"x": values.transpose(1, 2, 0)})
+        assert np.isnan(dataset.x.values[1])
+
     def test_geweke(self):
         first = 0.1
         last = 0.5
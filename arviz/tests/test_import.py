@@ -0,0 +1,54 @@
+"""
+Tests for the lazy loading of arviz submodules
+"""
+
+import subprocess
+import sys
+
+import arviz as az
+from arviz import plots, stats
+
+
+def test_import_is_lazy():
+    """Importing arviz does not import pyplot or scipy"""
+    code = (
+        "import sys, arviz; "
+        "print('matplotlib.pyplot' in sys.modules, 'scipy' in sys.modules, 'arviz.plots' in sys.modules)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+    assert output.split() == ["False", "False", "False"]
+
+
+def test_styles_registered_on_import():
+    """ArviZ's matplotlib styles are available without touching arviz.plots"""
+    code = (
+        "import arviz, matplotlib.pyplot as plt; "
+        "plt.style.use('arviz-darkgrid'); "
+        "import sys; print('arviz.plots' in sys.modules)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+    assert output.split() == ["False"]
+
+
+def test_lazy_names_match_submodules():
+    """The lazily loaded names are exactly the names exported by each submodule"""
+    # pylint: disable=protected-access
+    assert set(az._LAZY_SUBMODULES["plots"]) == set(plots.__all__)
+    assert set(az._LAZY_SUBMODULES["stats"]) == set(stats.__all__)
+
+
+def test_lazy_attributes():
+    """Every lazily loaded name is exported by its submodule"""
+    for name in plots.__all__:
+        assert getattr(az, name) is getattr(plots, name)
+    for name in stats.__all__:
+        assert getattr(az, name) is getattr(stats, name)
+    assert "arviz-darkgrid" in az.style.available
+
+
+def test_star_import():
+    """Star import exports the same names as before, including the private kde helpers"""
+    namespace = {}
+    exec("from arviz import *", namespace)  # pylint: disable=exec-used
+    for name in ("plot_kde", "_fast_kde", "_fast_kde_2d", "summary", "style", "from_pymc3"):
+        assert name in namespace
@@ -3,7 +3,13 @@ import numpy as np
 import xarray as xr
 import pytest
 
-from ..plots.plot_utils import xarray_to_ndarray, xarray_var_iter, get_coords
+from ..plots.plot_utils import (
+    xarray_to_ndarray,
+    xarray_var_iter,
+    get_coords,
+    make_label,
+    _histogram_2d_batch,
+)
 
 
 @pytest.fixture(scope="function")
@@ -46,6 +52,38 @@ def test_dataset_to_numpy_combined(sample_dataset):
     assert (data[1] == tau.reshape(1, 6)).all()
 
 
+@pytest.mark.parametrize("combined", [True, False])
+def test_dataset_to_numpy_dims(combined):
+    data = xr.Dataset(
+        {
+            "theta": (["chain", "draw", "school"], np.random.randn(2, 5, 3)),
+            "sigma": (["school", "chain", "draw"], np.random.randn(3, 2, 5)),
+        },
+        coords={"school": ["a", "b", "c"]},
+    )
+    var_names, values = xarray_to_ndarray(data, combined=combined)
+
+    assert values.shape == ((6, 10) if combined else (12, 5))
+    plotters = list(xarray_var_iter(data, combined=combined))
+    assert var_names == [make_label(var_name, selection) for var_name, selection, _ in plotters]
+    assert np.all(values == np.array([vals.flatten() for _, _, vals in plotters]))
+
+    _, sigma = xarray_to_ndarray(data, var_names=["sigma"], combined=True)
+    assert np.shares_memory(sigma, data.sigma.values)
+
+
+@pytest.mark.parametrize("ranges", [None, ((-1, 1), (0, 2))])
+def test_histogram_2d_batch(ranges):
+    x, y = np.random.randn(3, 500), 2 * np.random.randn(3, 500)
+    counts, xmin, xmax, ymin, ymax = _histogram_2d_batch(x, y, (20, 10), ranges)
+    assert counts.shape == (3, 10, 20)
+    for idx in range(3):
+        hist, xedges, yedges = np.histogram2d(x[idx], y[idx], bins=(20, 10), range=ranges)
+        assert np.all(counts[idx] == hist.T)
+        assert (xmin[idx], xmax[idx]) == (xedges[0], xedges[-1])
+        assert (ymin[idx], ymax[idx]) == (yedges[0], yedges[-1])
+
+
 def test_xarray_var_iter_ordering_combined(sample_dataset):  # pylint: disable=invalid-name
     """Assert that varname order stays consistent when chains are combined"""
     _, _, data = sample_dataset
@@ -68,6 +106,34 @@ def test_xarray_var_iter_ordering_uncombined(sample_dataset):  # pylint: disable
         ]
 
 
+@pytest.mark.parametrize("combined", [True, False])
+@pytest.mark.parametrize("reverse_selections", [True, False])
+def test_xarray_var_iter_selections(combined, reverse_selections):
+    """Assert that the positional slices match label based selections"""
+    data = xr.Dataset(
+        {"theta": (["school", "chain", "draw", "param"], np.random.randn(3, 2, 5, 4))},
+        coords={"school": ["a", "b", "c"], "param": [10, 20, 30, 40]},
+    )
+    plotters = list(
+        xarray_var_iter(
+            data,
+            combined=combined,
+            skip_dims={"param"},
+            reverse_selections=reverse_selections,
+        )
+    )
+
+    assert len(plotters) == (3 if combined else 6)
+    schools = [selection["school"] for _, selection, _ in plotters]
+    if reverse_selections:
+        schools = schools[::-1]
+    assert schools == sorted(schools)
+    for var_name, selection, values in plotters:
+        expected = data[var_name].sel(**selection).values
+        assert values.shape == expected.shape
+        assert np.all(values == expected)
+
+
 class TestCoordsExceptions:
     def test_invalid_coord_name(self, sample_dataset):  # pylint: disable=invalid-name
         """Assert that nicer exception appears when user enters wrong coords name"""
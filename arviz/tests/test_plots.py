@@ -2,8 +2,11 @@
 import os
 import time
 from unittest.mock import MagicMock
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb, to_rgba
 import matplotlib.pyplot as plt
 from pandas import DataFrame
+from scipy.stats import entropy, gaussian_kde, norm
 import xarray as xr
 import numpy as np
 import pytest
@@ -29,7 +32,20 @@ from ..plots import (
     plot_kde,
     plot_khat,
     plot_hpd,
+    kde_cache,
 )
+from ..plots.kdeplot import (
+    _fast_kde,
+    _fast_kde_batch,
+    _fast_kde_rows,
+    _fast_kde_2d,
+    _fast_kde_2d_batch,
+)
+from ..plots.pairplot import _iter_pairs
+from ..plots.parallelplot import _parallel_counts
+from ..plots.plot_utils import _histogram_2d_batch
+from ..plots.ppcplot import _ppc_densities
+from ..plots.traceplot import _decimate_minmax
 
 from ..stats import psislw
 
@@ -139,6 +155,8 @@ def test_plot_density_discrete(discrete_model):
         {"divergences": False},
         {"lines": [("mu", {}, [1, 2])]},
         {"lines": [("mu", 0)]},
+        {"downsample": 10},
+        {"downsample": "auto"},
     ],
 )
 def test_plot_trace(models, model_fit, kwargs):
@@ -157,6 +175,29 @@ def test_plot_trace_discrete(discrete_model):
     assert axes.shape
 
 
+def test_plot_trace_downsample():
+    data = {"x": np.random.randn(2, 10000), "y": np.random.randint(10, size=(2, 10000))}
+    axes = plot_trace(data, downsample=50)
+    for ax, var_name in zip(axes[:, 1], ("x", "y")):
+        for line, values in zip(ax.get_lines(), data[var_name]):
+            assert len(line.get_ydata()) == 100
+            assert line.get_ydata().min() == values.min()
+            assert line.get_ydata().max() == values.max()
+    assert plot_trace(data, downsample="auto").shape == (2, 2)
+
+
+@pytest.mark.parametrize("n_draws", [10, 999, 1000, 1001])
+def test_decimate_minmax(n_draws):
+    values = np.random.randn(3, n_draws)
+    trace_x, trace_y = _decimate_minmax(values, 100)
+    assert trace_x.shape == trace_y.shape
+    assert np.all(np.diff(trace_x, axis=1) >= 0)
+    assert np.all(trace_y == np.take_along_axis(values, trace_x, axis=1))
+    assert np.all(trace_y.min(axis=1) == values.min(axis=1))
+    assert np.all(trace_y.max(axis=1) == values.max(axis=1))
+    assert trace_x.shape[1] <= max(n_draws, 200)
+
+
 @pytest.mark.parametrize(
     "model_fits",
     [["tfp_fit"], ["pyro_fit"], ["pymc3_fit"], ["stan_fit"], ["pymc3_fit", "stan_fit"]],
@@ -183,6 +224,15 @@ def test_plot_forest_single_value():
     assert axes.shape
 
 
+@pytest.mark.parametrize("colors", [[(1, 0, 0)], [(1, 0, 0), (0, 0, 1)], ["red", (0, 0, 1)]])
+def test_plot_forest_rgb_colors(colors):
+    data = [{"x": np.random.randn(2, 50, 3)} for _ in colors]
+    _, axes = plot_forest(data, colors=colors, r_hat=True, eff_n=True)
+    for ax in axes:
+        plotted = [to_rgb(line.get_color()) for line in ax.get_lines()]
+        assert set(plotted) == {to_rgb(color) for color in colors}
+
+
 @pytest.mark.parametrize("model_fit", ["pymc3_fit", "stan_fit"])
 @pytest.mark.parametrize("kind", ["kde", "hist"])
 def test_plot_energy(models, model_fit, kind):
@@ -196,9 +246,23 @@ def test_plot_parallel_raises_valueerror(df_trace):  # pylint: disable=invalid-n
 
 
 @pytest.mark.parametrize("model_fit", ["pymc3_fit", "stan_fit"])
-def test_plot_parallel(models, model_fit):
+@pytest.mark.parametrize("kind", ["lines", "raster"])
+def test_plot_parallel(models, model_fit, kind):
     obj = getattr(models, model_fit)
-    assert plot_parallel(obj, var_names=["mu", "tau"])
+    assert plot_parallel(obj, var_names=["mu", "tau"], kind=kind)
+
+
+def test_parallel_counts():
+    values = np.random.randn(3, 1000)
+    values[1, 0] = np.nan
+    counts, (ymin, ymax) = _parallel_counts(values, (8, 16))
+    assert counts.shape == (16, 16)
+    assert np.all(counts.sum(axis=0) == 999)
+    assert ymin == np.nanmin(values[:, 1:])
+    assert ymax == np.nanmax(values[:, 1:])
+    # the columns next to a variable match its histogram
+    hist, _ = np.histogram(values[0, 1:], bins=16, range=(ymin, ymax))
+    assert np.abs(counts[:, 0] - hist).sum() < 0.1 * 999
 
 
 def test_plot_parallel_exception(models):
@@ -241,6 +305,113 @@ def test_plot_kde_cumulative(discrete_model, kwargs):
     assert axes
 
 
+def test_fast_kde_batch():
+    # normal quantiles, so that the agreement of the grids does not depend on the draws
+    values = np.full((5, 1000), np.nan)
+    values[2:] = norm.ppf(np.linspace(0.0005, 0.9995, 1000)) * np.arange(3, 6)[:, None]
+    # fewer finite values give a row fewer grid points of its own than the shared grid
+    values[0, :30] = norm.ppf(np.linspace(0.01, 0.99, 30))
+    values[1, :100] = norm.ppf(np.linspace(0.005, 0.995, 100)) * 2
+    density, lower, upper = _fast_kde_batch(values)
+    assert density.shape[0] == 5
+    for row, row_density, row_lower, row_upper in zip(values, density, lower, upper):
+        single_density, single_lower, single_upper = _fast_kde_batch(row)
+        assert (row_lower, row_upper) == (single_lower[0], single_upper[0])
+        assert np.allclose(_fast_kde_batch(row, gridsize=len(row_density))[0][0], row_density)
+        # on its own grid the row has the same bandwidth in data units
+        single_grid = np.linspace(row_lower, row_upper, single_density.shape[1])
+        row_grid = np.linspace(row_lower, row_upper, len(row_density))
+        assert np.allclose(
+            np.interp(row_grid, single_grid, single_density[0]),
+            row_density,
+            rtol=0,
+            atol=0.02 * single_density.max(),
+        )
+        assert np.all(_fast_kde(row)[0] == single_density[0])
+    cumulative = _fast_kde_batch(values, cumulative=True)[0]
+    assert np.allclose(cumulative[:, -1], 1)
+
+
+def test_fast_kde_rows():
+    rows = [np.random.randn(100), np.random.randn(300), np.random.randn(100)]
+    kdes = _fast_kde_rows(rows)
+    # rows of the same length are estimated together
+    density, lower, upper = _fast_kde_batch([rows[0], rows[2]])
+    assert np.all(kdes[2][0] == density[1])
+    assert (kdes[2][1], kdes[2][2]) == (lower[1], upper[1])
+    assert np.all(kdes[1][0] == _fast_kde(rows[1])[0])
+    with kde_cache():
+        for kde, row in zip(_fast_kde_rows(rows), rows):
+            assert np.all(kde[0] == _fast_kde(row)[0])
+
+
+@pytest.mark.parametrize("gridsize", [None, 512])
+def test_fast_kde_reference(gridsize):
+    values = np.random.randn(5000)
+    density, lower, upper = _fast_kde(values, gridsize=gridsize)
+    # same bandwidth in data units as _fast_kde, which sets it on its own grid
+    std_x = entropy(values - lower) * 4.5
+    n_bins = min(int(len(values) ** (1 / 3) * std_x * 2), 200)
+    bandwidth = len(values) ** -0.2 * std_x * (upper - lower) / (n_bins - 1)
+    grid = np.linspace(lower, upper, len(density))
+    expected = gaussian_kde(values, bw_method=bandwidth / values.std(ddof=1))(grid)
+    assert np.allclose(density, expected, atol=0.02 * expected.max())
+
+
+@pytest.mark.parametrize("gridsize", [None, 50, 2000])
+def test_fast_kde_gridsize(gridsize):
+    values = np.random.randn(10000)
+    density, lower, upper = _fast_kde(values, gridsize=gridsize)
+    if gridsize is not None:
+        assert len(density) == gridsize
+    d_x = (upper - lower) / (len(density) - 1)
+    assert np.isclose(density.sum() * d_x, 1, atol=0.02)
+    assert np.isclose(np.linspace(lower, upper, len(density))[density.argmax()], 0, atol=0.2)
+
+
+def test_fast_kde_2d():
+    values = np.random.multivariate_normal([0, 0], [[1, 0.8], [0.8, 2]], size=5000).T
+    density, xmin, xmax, ymin, ymax = _fast_kde_2d(*values)
+    x_x, y_y = np.mgrid[xmin:xmax:128j, ymin:ymax:128j]
+    expected = gaussian_kde(values)(np.vstack([x_x.ravel(), y_y.ravel()])).reshape(128, 128)
+    assert np.allclose(density, expected, atol=0.05 * expected.max())
+    assert np.isclose(density.sum() * (xmax - xmin) * (ymax - ymin) / 127 ** 2, 1, atol=0.01)
+
+    # non finite values drop the whole point, keeping x and y aligned
+    x_nan = values[0].copy()
+    x_nan[:50] = np.nan
+    assert np.allclose(_fast_kde_2d(x_nan, values[1])[0], _fast_kde_2d(*values[:, 50:])[0])
+
+    batch = _fast_kde_2d_batch(values, values[::-1])[0]
+    assert np.allclose(batch[0], density)
+    assert np.allclose(batch[1], density.T)
+
+
+def test_kde_cache(monkeypatch):
+    calls = []
+
+    def counted_kde(*args, **kwargs):
+        calls.append(args)
+        return _fast_kde_batch(*args, **kwargs)
+
+    monkeypatch.setattr("arviz.plots.kdeplot._fast_kde_batch", counted_kde)
+    values = [np.random.randn(1000) for _ in range(3)]
+    density = _fast_kde(values[0])[0]
+    with kde_cache(max_bytes=2 * density.nbytes) as cache:
+        assert np.all(_fast_kde(values[0])[0] == density)
+        assert np.all(_fast_kde(values[0].copy())[0] == density)
+        assert len(calls) == 2
+        _fast_kde(values[0], bw=2)
+        _fast_kde(values[1])
+        assert len(cache) == 2
+        _fast_kde(values[0])
+        assert len(calls) == 5
+        with kde_cache() as inner_cache:
+            assert inner_cache is cache
+    _fast_kde(values[1])
+    assert len(calls) == 6
+
+
 def test_plot_khat():
     linewidth = np.random.randn(20000, 10)
     _, khats = psislw(linewidth)
@@ -275,6 +446,7 @@ def test_plot_khat():
             "plot_kwargs": {"cmap": "viridis"},
             "textsize": 20,
         },
+        {"kind": "raster", "divergences": True, "var_names": ["theta", "mu"]},
     ],
 )
 def test_plot_pair(models, model_fit, kwargs):
@@ -284,7 +456,13 @@ def test_plot_pair(models, model_fit, kwargs):
 
 
 @pytest.mark.parametrize(
-    "kwargs", [{"kind": "scatter"}, {"kind": "kde"}, {"kind": "hexbin", "colorbar": True}]
+    "kwargs",
+    [
+        {"kind": "scatter"},
+        {"kind": "kde"},
+        {"kind": "hexbin", "colorbar": True},
+        {"kind": "raster", "gridsize": (10, 5)},
+    ],
 )
 def test_plot_pair_2var(discrete_model, fig_ax, kwargs):
     _, ax = fig_ax
@@ -292,6 +470,32 @@ def test_plot_pair_2var(discrete_model, fig_ax, kwargs):
     assert ax
 
 
+def test_plot_pair_kde_plot_kwargs():
+    data = {"x": np.random.randn(500), "y": np.random.randn(500), "z": np.random.randn(500)}
+    plot_kwargs = {"contour_kwargs": {"colors": "k"}}
+    _, ax = plt.subplots(2, 2)
+    plot_pair(data, kind="kde", ax=ax, plot_kwargs=plot_kwargs)
+    contour_colors = ax[0, 0].collections[-1].get_edgecolor()
+    assert np.all(contour_colors == to_rgba("k"))
+    with pytest.raises(TypeError):
+        plot_pair(data, kind="kde", plot_kwargs={"not_a_kwarg": 1})
+
+
+@pytest.mark.parametrize("func", [_fast_kde_2d_batch, _histogram_2d_batch])
+def test_iter_pairs(func):
+    values = np.random.randn(4, 200)
+    pairs = [(0, 1), (0, 2), (1, 3), (2, 3), (3, 0)]
+    kwargs = {"gridsize": (16, 16)} if func is _fast_kde_2d_batch else {"bins": (8, 8)}
+    expected = func(values[[0, 0, 1, 2, 3]], values[[1, 2, 3, 3, 0]], **kwargs)
+    # two pairs per chunk
+    chunked = list(_iter_pairs(func, values, pairs, pair_size=100, max_size=200, **kwargs))
+    assert len(chunked) == len(pairs)
+    for idx, items in enumerate(chunked):
+        for item, batch_item in zip(items, expected):
+            # KDE grids are padded for the widest kernel of the chunk, tails differ slightly
+            assert np.allclose(item, batch_item[idx], atol=1e-3 * np.abs(batch_item[idx]).max())
+
+
 @pytest.mark.parametrize("kind", ["density", "cumulative", "scatter"])
 def test_plot_ppc(models, pymc3_sample_ppc, kind):
     data = from_pymc3(trace=models.pymc3_fit, posterior_predictive=pymc3_sample_ppc)
@@ -314,6 +518,35 @@ def test_plot_ppc_discrete(kind):
     assert axes
 
 
+@pytest.mark.parametrize("kind", ["density", "cumulative"])
+@pytest.mark.parametrize("dtype", [float, int])
+def test_plot_ppc_bands(kind, dtype):
+    data = MagicMock(spec=InferenceData)
+    data.observed_data = xr.Dataset({"obs": (["obs_dim_0"], np.arange(20, dtype=dtype))})
+    data.posterior_predictive = xr.Dataset(
+        {"obs": (["chain", "draw", "obs_dim_0"], (np.random.randn(1, 100, 20) * 5).astype(dtype))}
+    )
+    axes = plot_ppc(data, kind=kind, bands=(0.5, 0.94))
+    labels = [collection.get_label() for collection in axes[0].collections]
+    assert sum(label.endswith("interval") for label in labels) == 2
+    axes = plot_ppc(data, kind=kind, mean=False)
+    lines = [
+        collection for collection in axes[0].collections if isinstance(collection, LineCollection)
+    ]
+    assert len(lines) == 1
+    assert len(lines[0].get_segments()) == 100
+
+
+def test_ppc_densities_discrete():
+    values = np.random.poisson(4, size=(10, 50))
+    values[0] = 3
+    pp_x, pp_density = _ppc_densities(values, "i")
+    for vals, x_vals, density in zip(values, pp_x, pp_density):
+        hist, bin_edges = np.histogram(vals, bins=round(len(vals) ** 0.5), density=True)
+        assert np.allclose(x_vals, bin_edges)
+        assert np.allclose(density, np.concatenate((hist[:1], hist)))
+
+
 def test_plot_ppc_grid(models, pymc3_sample_ppc):
     data = from_pymc3(trace=models.pymc3_fit, posterior_predictive=pymc3_sample_ppc)
     axes = plot_ppc(data, kind="scatter", flatten=[])
@@ -32,6 +32,14 @@ def test_hpd():
     assert_array_almost_equal(interval, [-1.88, 1.88], 2)
 
 
+def test_hpd_2d():
+    samples = np.random.randn(1000, 5) * np.arange(1, 6)
+    interval = hpd(samples)
+    assert interval.shape == (5, 2)
+    for column, column_interval in zip(samples.T, interval):
+        assert_array_almost_equal(column_interval, hpd(column))
+
+
 def test_r2_score():
     x = np.linspace(0, 1, 100)
     y = np.random.normal(x, 1)
@@ -75,6 +83,30 @@ def test_summary_fmt(centered_eight, fmt):
     assert summary(centered_eight, fmt=fmt) is not None
 
 
+def test_summary_max_draws(centered_eight):
+    np.random.seed(0)
+    exact = summary(centered_eight, round_to=6)
+    approx = summary(centered_eight, max_draws=400, round_to=6)
+    assert list(approx.index) == list(exact.index)
+    assert "approx error" in approx.columns
+    assert "approx error" not in exact.columns
+    assert np.all(np.abs(approx["mean"] - exact["mean"]) < 5 * approx["approx error"])
+    assert np.all(approx[["eff_n", "r_hat"]] == exact[["eff_n", "r_hat"]])
+    assert "approx error" not in summary(centered_eight, max_draws=10 ** 6).columns
+
+
+def test_summary_max_draws_seed(centered_eight):
+    first = summary(centered_eight, max_draws=400, seed=3)
+    second = summary(centered_eight, max_draws=400, seed=np.random.RandomState(3))
+    assert first.equals(second)
+
+
+@pytest.mark.parametrize("max_draws", [1, 4, 79])
+def test_summary_max_draws_too_few(centered_eight, max_draws):
+    with pytest.raises(ValueError):
+        summary(centered_eight, max_draws=max_draws)
+
+
 def test_summary_bad_fmt(centered_eight):
     with pytest.raises(TypeError):
         summary(centered_eight, fmt="bad_fmt")
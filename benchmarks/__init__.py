@@ -0,0 +1 @@
+"""Benchmarks for ArviZ, run with airspeed velocity (asv)."""
@@ -0,0 +1,155 @@
+# pylint: disable=attribute-defined-outside-init,too-few-public-methods
+"""Benchmarks for ArviZ.
+
+Run with airspeed velocity from the root of the repository, e.g. compare
+the current commit to master with
+
+    asv continuous master HEAD
+"""
+from collections import OrderedDict
+import itertools
+import subprocess
+import sys
+
+import numpy as np
+
+from arviz import batch_convert_to_inference_data
+from arviz.data.io_pystan import get_draws
+from arviz.plots.kdeplot import _fast_kde, _fast_kde_2d
+
+
+class _PyHolder:
+    """Minimal stand in for the per chain sample holder of PyStan."""
+
+    def __init__(self, chains):
+        self.chains = chains
+
+
+class _StanFit:
+    """Minimal stand in for a PyStan fit, so benchmarks do not compile Stan models."""
+
+    mode = 0
+
+    def __init__(self, shapes, nchain, ndraw):
+        pars = list(shapes) + ["lp__"]
+        dims = [list(shape) for shape in shapes.values()] + [[]]
+        fnames = []
+        for par, dim in zip(pars, dims):
+            if not dim:
+                fnames.append(par)
+                continue
+            # Stan flattens in column-major order
+            for idx in itertools.product(*(range(1, size + 1) for size in dim[::-1])):
+                fnames.append("{}[{}]".format(par, ",".join(map(str, idx[::-1]))))
+        samples = [
+            _PyHolder(OrderedDict((name, np.random.randn(ndraw)) for name in fnames))
+            for _ in range(nchain)
+        ]
+        self.sim = {
+            "samples": samples,
+            "pars_oi": pars,
+            "dims_oi": dims,
+            "fnames_oi": fnames,
+            "n_save": [ndraw] * nchain,
+            "warmup2": [0] * nchain,
+        }
+        self.model_pars = pars
+
+    @staticmethod
+    def get_stancode():
+        return "parameters { real mu; matrix[N, M] theta; }"
+
+
+class PyStanGetDraws:
+    """Extraction of draws from a fit with many flat parameters."""
+
+    params = [10, 100]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.fit = _StanFit({"mu": [], "theta": [size, size]}, nchain=4, ndraw=500)
+
+    def time_get_draws(self, size):
+        get_draws(self.fit)
+
+
+class FastKde:
+    """1D kernel density estimates of long traces."""
+
+    params = ([10 ** 4, 10 ** 6], [None, 2048])
+    param_names = ["draws", "gridsize"]
+
+    def setup(self, draws, gridsize):
+        self.values = np.random.randn(draws)
+
+    def time_fast_kde(self, draws, gridsize):
+        _fast_kde(self.values, gridsize=gridsize)
+
+
+class FastKde2d:
+    """2D kernel density estimates, as used by plot_kde and plot_pair."""
+
+    params = [128, 512]
+    param_names = ["gridsize"]
+
+    def setup(self, gridsize):
+        self.values = np.random.multivariate_normal([0, 0], [[1, 0.8], [0.8, 2]], size=10000).T
+
+    def time_fast_kde_2d(self, gridsize):
+        _fast_kde_2d(*self.values, gridsize=(gridsize, gridsize))
+
+
+class BatchConvertPyMC3:
+    """Conversion of PyMC3 traces, where the pointwise log likelihood dominates the cost.
+
+    Every trace is pickled and sent to a worker, and its InferenceData is sent back.
+    """
+
+    params = [1, 4]
+    param_names = ["n_jobs"]
+    timeout = 600
+
+    def setup_cache(self):
+        try:
+            import pymc3 as pm
+        except ImportError:
+            raise NotImplementedError("PyMC3 is not installed")
+
+        x = np.random.randn(2000)
+        y = 1 + 2 * x + np.random.randn(2000)
+        with pm.Model():
+            alpha = pm.Normal("alpha", 0, 10)
+            beta = pm.Normal("beta", 0, 10)
+            sigma = pm.HalfNormal("sigma", 5)
+            pm.Normal("y", alpha + beta * x, sigma, observed=y)
+            return pm.sample(1000, chains=2, tune=200, cores=1, progressbar=False)
+
+    def time_batch_convert(self, trace, n_jobs):
+        batch_convert_to_inference_data([trace] * 8, n_jobs=n_jobs)
+
+
+class ImportArviz:
+    """Cost of ``import arviz`` in a fresh interpreter."""
+
+    timeout = 120
+
+    def time_import(self):
+        subprocess.check_call([sys.executable, "-c", "import arviz"])
+
+    def track_importtime(self):
+        """Cumulative import time of arviz in microseconds, as reported by -X importtime."""
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import arviz"],
+            stderr=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        ).stderr
+        for line in reversed(output.splitlines()):
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = line.split("|")
+            if name.strip() == "arviz":
+                return int(cumulative)
+        raise RuntimeError("-X importtime requires python 3.7 or newer")
+
+    track_importtime.unit = "us"